@@ -1,11 +1,37 @@
 import sys
 import os
+from functools import lru_cache
+from typing import Optional, Tuple
 from flask import Flask, render_template, request, jsonify
-from src.live_odds import LiveOddsCalculator, parse_cards_string
+from flask.json.provider import DefaultJSONProvider
+from src.deck import Card
+from src.live_odds import LiveOddsCalculator
+from src.parsing import parse_cards_string
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+try:
+    import orjson
+except ImportError:  # fall back to Flask's stdlib json provider
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for request parsing and jsonify()."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Equity dicts are keyed by player index, so allow non-str keys
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__, static_folder='static', template_folder='templates')
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+NUM_SIMS = 10_000
 
 
 @app.route('/')
@@ -56,17 +82,7 @@ def calculate_odds():
             except ValueError:
                 pass
 
-        equities = calc.calculate_equities(num_sims=10000)
-
-        response = {
-            'status': 'success',
-            'equities': equities,
-            'win_probs': calc.last_outright_win_probabilities,
-            'split_prob': calc.last_split_probability,
-            'street': calc.street
-        }
-
-        return jsonify(response)
+        return jsonify(_equities_cached(_state_key(calc)))
 
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -74,6 +90,72 @@ def calculate_odds():
         return jsonify({'error': f"Server Error: {str(e)}"}), 500
 
 
+def _state_key(calc: LiveOddsCalculator) -> tuple:
+    """
+    Hashable key for a validated calculator state.
+
+    Hole cards and flop cards are sorted, so "AsKh" and "KhAs" share a key;
+    player order, turn and river keep their positions.
+    """
+    hands = tuple(tuple(sorted(c.idx for c in hand)) for hand in calc.player_hands)
+    board = [c.idx for c in calc.board]
+    board = tuple(sorted(board[:3]) + board[3:])
+    return calc.num_players, hands, board, tuple(sorted(calc.folded_players))
+
+
+def _build_calculator(num_players: int, hands: tuple, board: tuple) -> LiveOddsCalculator:
+    calc = LiveOddsCalculator(num_players)
+    for hand in hands:
+        calc.add_player_hand([Card.from_idx(i) for i in hand])
+    if board:
+        calc.set_board([Card.from_idx(i) for i in board])
+    return calc
+
+
+def _response(calc: LiveOddsCalculator, equities: dict) -> dict:
+    return {
+        'status': 'success',
+        'equities': equities,
+        'win_probs': calc.last_outright_win_probabilities,
+        'split_prob': calc.last_split_probability,
+        'street': calc.street
+    }
+
+
+@lru_cache(maxsize=1024)
+def _unfolded_result(num_players: int, hands: tuple, board: tuple) -> Tuple[dict, Optional[LiveOddsCalculator]]:
+    """
+    Simulate a spot with nobody folded.
+
+    Returns the response and, preflop only, the calculator whose samples fold
+    variants re-score. It keeps one int8 rank per player and simulation
+    (NUM_SIMS * num_players bytes); flop and turn runouts are cheap to
+    enumerate again, so nothing but the response is kept for them.
+    """
+    calc = _build_calculator(num_players, hands, board)
+    equities = calc.calculate_equities(num_sims=NUM_SIMS)
+    return _response(calc, equities), (None if board else calc)
+
+
+@lru_cache(maxsize=8192)
+def _equities_cached(key: tuple) -> dict:
+    """
+    /calculate result for a _state_key(), computed once per distinct state.
+
+    Toggling folds on the same hands and board reuses the unfolded spot's
+    preflop simulation rather than running a new one.
+    """
+    num_players, hands, board, folded = key
+    response, base = _unfolded_result(num_players, hands, board)
+    if not folded:
+        return response
+
+    calc = base.copy() if base is not None else _build_calculator(num_players, hands, board)
+    for idx in folded:
+        calc.fold_player(idx)
+    return _response(calc, calc.calculate_equities(num_sims=NUM_SIMS))
+
+
 @app.route('/preflop/meta', methods=['GET'])
 def preflop_meta():
     return jsonify({
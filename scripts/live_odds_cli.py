@@ -1,12 +1,16 @@
-from src.live_odds import LiveOddsCalculator, parse_cards_string
+from src.live_odds import LiveOddsCalculator
+from src.parsing import parse_cards_string
 from src.deck import Card
 from src.evaluator import handtype
 from tqdm import tqdm
 
 
+# Stop simulating once each equity is within ±0.5% (95% confidence)
+TOL = 0.005
+
+
 def format_card(card: Card) -> str:
-    suit_symbols = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
-    return f"{card.rank}{suit_symbols[card.suit]}"
+    return str(card)
 
 
 def format_cards(cards: list) -> str:
@@ -179,9 +183,9 @@ def main():
     print("Calculating pre-flop equities")
     print("=" * 30)
     # Pre-flop
-    print("Simulating 50,000 random boards...")
+    print("Simulating up to 50,000 random boards...")
 
-    equities = calc.calculate_equities(num_sims=50_000)
+    equities = calc.calculate_equities(num_sims=50_000, tol=TOL)
     display_equities(calc, equities, show_board=False)
 
     # Allow folding pre-flop
@@ -190,7 +194,7 @@ def main():
         print("Updated flop equities")
         print("=" * 30)
         print("Recalculating with remaining players...")
-        equities = calc.calculate_equities(num_sims=50_000)
+        equities = calc.calculate_equities(num_sims=50_000, tol=TOL)
         display_equities(calc, equities)
 
         # Check if only one player remains
@@ -225,9 +229,9 @@ def main():
     print("=" * 30)
     print("Calculating flop equities")
     print("=" * 30)
-    print("Simulating 50,000 turn/river combinations...")
+    print("Evaluating every turn/river combination...")
     # Flop
-    equities = calc.calculate_equities(num_sims=50_000)
+    equities = calc.calculate_equities()
     display_equities(calc, equities)
 
     # Allow folding on flop
@@ -236,7 +240,7 @@ def main():
         print("Updated flop equities")
         print("=" * 30)
         print("Recalculating with remaining players...")
-        equities = calc.calculate_equities(num_sims=50_000)
+        equities = calc.calculate_equities()
         display_equities(calc, equities)
 
         # Check if only one player remains
@@ -271,9 +275,9 @@ def main():
     print("=" * 30)
     print("Calculating turn equities")
     print("=" * 30)
-    print("Simulating 10,000 river cards...")
+    print("Evaluating every river card...")
 
-    equities = calc.calculate_equities(num_sims=10_000)
+    equities = calc.calculate_equities()
     display_equities(calc, equities)
 
     # Allow folding on turn
@@ -282,7 +286,7 @@ def main():
         print("Updated flop equities")
         print("=" * 30)
         print("Recalculating with remaining players...")
-        equities = calc.calculate_equities(num_sims=50_000)
+        equities = calc.calculate_equities()
         display_equities(calc, equities)
 
         # Check if only one player remains
@@ -1,8 +1,16 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Tuple
 import random
 
 
+RANKS = ('A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2')
+SUITS = ('s', 'h', 'd', 'c')
+
+_RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+_SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+SUIT_SYMBOLS = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
+
+
 @dataclass(frozen=True)
 class Card:
     """
@@ -11,50 +19,116 @@ class Card:
     Attributes:
         rank: Card rank ('A', 'K', 'Q', 'J', 'T', '9', ..., '2')
         suit: Card suit ('s'=spades, 'h'=hearts, 'd'=diamonds, 'c'=clubs)
+        idx: Integer encoding rank_idx * 4 + suit_idx (0 = A♠, ..., 51 = 2♣),
+            used by the hot paths instead of comparing strings
     """
     rank: str
     suit: str
+    idx: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.rank not in _RANK_INDEX or self.suit not in _SUIT_INDEX:
+            raise ValueError(f"Invalid card: {self.rank}{self.suit}")
+        object.__setattr__(self, 'idx', _RANK_INDEX[self.rank] * 4 + _SUIT_INDEX[self.suit])
+
+    # idx identifies the card, so hashing and equality use one int instead
+    # of a (rank, suit) tuple
+    def __eq__(self, other) -> bool:
+        if other.__class__ is Card:
+            return self.idx == other.idx
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self.idx
+
+    @staticmethod
+    def from_idx(idx: int) -> 'Card':
+        """Return the Card with integer encoding idx (0..51)."""
+        return ALL_CARDS[idx]
 
     def __str__(self) -> str:
-        suit_symbols = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
-        return f"{self.rank}{suit_symbols.get(self.suit, self.suit)}"
+        return _CARD_STRINGS[self.idx]
 
     def __repr__(self) -> str:
         return f"Card('{self.rank}', '{self.suit}')"
 
 
+# Every card, built once at import; ALL_CARDS[i].idx == i. Decks and hot
+# paths share these instances instead of constructing new Cards.
+ALL_CARDS: Tuple[Card, ...] = tuple(Card(RANKS[i // 4], SUITS[i % 4]) for i in range(52))
+
+# str() of every card, indexed by Card.idx
+_CARD_STRINGS = tuple(f"{card.rank}{SUIT_SYMBOLS[card.suit]}" for card in ALL_CARDS)
+
+# Unshuffled dealing order (suit by suit); deal_one() pops from the end
+_DECK_ORDER = tuple(r * 4 + s for s in range(len(SUITS)) for r in range(len(RANKS)))
+
+FULL_MASK = (1 << 52) - 1
+
+
 class Deck:
-    RANKS = ['A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2']
-    SUITS = ['s', 'h', 'd', 'c']
+    """
+    Deck of 52 cards stored as a bitmask of live cards plus a dealing order.
+
+    Bit i of the mask is set while the card with idx i is still in the deck,
+    so removing a card is a single bit clear. The order list holds card
+    indices in dealing order; entries whose bit was cleared by remove_idx()
+    are skipped when dealing.
+    """
+    RANKS = RANKS
+    SUITS = SUITS
 
     def __init__(self):
         self.reset()
 
     def reset(self) -> None:
-        self._cards: List[Card] = [
-            Card(rank, suit)
-            for suit in self.SUITS
-            for rank in self.RANKS
-        ]
+        self._mask: int = FULL_MASK
+        self._count: int = 52
+        self._order: List[int] = list(_DECK_ORDER)
+
+    @property
+    def _cards(self) -> List[Card]:
+        """Cards still in the deck, in dealing order (last card is dealt first)."""
+        mask = self._mask
+        return [ALL_CARDS[i] for i in self._order if (mask >> i) & 1]
+
+    @property
+    def mask(self) -> int:
+        return self._mask
 
     def shuffle(self, seed: int = None) -> None:
-        if seed is not None:
-            random.seed(seed)
-        random.shuffle(self._cards)
+        rng = random.Random(seed) if seed is not None else random
+        rng.shuffle(self._order)
+
+    def deal_one_idx(self) -> int:
+        order = self._order
+        while order:
+            idx = order.pop()
+            bit = 1 << idx
+            if self._mask & bit:
+                self._mask ^= bit
+                self._count -= 1
+                return idx
+        raise IndexError("Cannot deal from an empty deck")
 
     def deal_one(self) -> Card:
-        if not self._cards:
-            raise IndexError("Cannot deal from an empty deck")
-        return self._cards.pop()
+        return ALL_CARDS[self.deal_one_idx()]
+
+    def remove_idx(self, idx: int) -> None:
+        """Remove the card with integer encoding idx, if it is still in the deck."""
+        bit = 1 << idx
+        if self._mask & bit:
+            self._mask ^= bit
+            self._count -= 1
 
     def cards_remaining(self) -> int:
-        return len(self._cards)
+        return self._count
 
     def is_empty(self) -> bool:
-        return len(self._cards) == 0
+        return self._count == 0
 
     def __len__(self) -> int:
-        return len(self._cards)
+        return self._count
 
     def __str__(self) -> str:
-        return f"Deck({len(self._cards)} cards remaining)"
\ No newline at end of file
+        return f"Deck({self._count} cards remaining)"
\ No newline at end of file
@@ -1,8 +1,16 @@
-from typing import List
-import random
-from src.deck import Deck, Card
-from src.evaluator import evaluate
-from src.utils import sample_hand_from_class
+from functools import lru_cache
+from typing import List, Tuple
+import numpy as np
+from src.deck import Card
+from src.evaluator import evaluate, evaluate_many, finalize_many, partial_state
+from src.fastdeck import card_mask, sample_boards, within_tolerance
+from src.iso import canonicalize
+from src.utils import sample_hands_batch
+
+
+# With a tolerance, simulations run in batches of CHECK_SIMS and stop once
+# within_tolerance() holds
+CHECK_SIMS = 2_000
 
 
 def compute_heads_up_equity(
@@ -24,42 +32,7 @@ def compute_heads_up_equity(
     Returns:
         Equity as a float between 0 and 1 (e.g., 0.85 = 85% equity)
     """
-    if seed is not None:
-        random.seed(seed)
-
-    total_score = 0.0
-
-    for _ in range(num_sims):
-        deck = Deck()
-        deck.shuffle()
-
-        hero_hand = sample_hand_from_class(hand_class, excluded_cards=[])
-
-        # Remove hero cards from deck like it would happened during dealing
-        for card in hero_hand:
-            for i, deck_card in enumerate(deck._cards):
-                if deck_card.rank == card.rank and deck_card.suit == card.suit:
-                    deck._cards.pop(i)
-                    break
-
-        # Deal villain hand (2 cards)
-        villain_hand = [deck.deal_one(), deck.deal_one()]
-
-        # Deal board (5 cards)
-        board = [deck.deal_one() for _ in range(5)]
-
-        # Evaluate both hands
-        hero_strength = evaluate(hero_hand + board)
-        villain_strength = evaluate(villain_hand + board)
-
-        # Score the result
-        if hero_strength > villain_strength:
-            total_score += 1.0
-        elif hero_strength == villain_strength:
-            total_score += 0.5
-        # else: loss, add 0, so we do nothing
-
-    return total_score / num_sims
+    return _equity_vs_random(hand_class, 1, num_sims, seed)
 
 
 def compute_equity_vs_hand(
@@ -67,7 +40,8 @@ def compute_equity_vs_hand(
         villain_hand: List[Card],
         known_board: List[Card] = None,
         num_sims: int = 10_000,
-        seed: int = None
+        seed: int = None,
+        tol: float = None
 ) -> float:
     """
     Compute equity for specific hole cards with optional known board cards.
@@ -78,8 +52,10 @@ def compute_equity_vs_hand(
         hero_hand: Hero's 2 hole cards
         villain_hand: Villain's 2 hole cards
         known_board: Already-dealt board cards (0-5 cards)
-        num_sims: Number of simulations
+        num_sims: Number of simulations (an upper bound when tol is set)
         seed: Optional random seed
+        tol: Stop early once the 95% confidence half-width is below tol
+            (e.g. 0.005); None always runs num_sims
 
     Returns:
         Hero's equity (0.0 to 1.0)
@@ -93,8 +69,26 @@ def compute_equity_vs_hand(
     if len(known_board) > 5:
         raise ValueError("Board cannot have more than 5 cards")
 
-    if seed is not None:
-        random.seed(seed)
+    # Equity is invariant under suit relabelling, so isomorphic spots share
+    # one canonical form (and one cache entry)
+    hero, villain, board, _ = canonicalize(hero_hand, villain_hand, known_board)
+
+    # Unseeded Monte Carlo estimates are not memoized; every call resamples
+    if seed is None and len(board) < 5:
+        return _equity_vs_hand(hero, villain, board, num_sims, seed, tol)
+    return _equity_vs_hand_cached(hero, villain, board, num_sims, seed, tol)
+
+
+def _equity_vs_hand(
+        hero_hand: Tuple[Card, ...],
+        villain_hand: Tuple[Card, ...],
+        known_board: Tuple[Card, ...],
+        num_sims: int,
+        seed: int,
+        tol: float = None
+) -> float:
+    """compute_equity_vs_hand body, on validated and canonicalized inputs."""
+    hero_hand, villain_hand, known_board = list(hero_hand), list(villain_hand), list(known_board)
 
     if len(known_board) == 5:
         hero_strength = evaluate(hero_hand + known_board)
@@ -107,35 +101,37 @@ def compute_equity_vs_hand(
         else:
             return 0.0
 
-    total_score = 0.0
     cards_needed = 5 - len(known_board)
+    rng = np.random.default_rng(seed)
+    excluded = card_mask(hero_hand + villain_hand + known_board)
+    hero_state = partial_state([c.idx for c in hero_hand + known_board])
+    villain_state = partial_state([c.idx for c in villain_hand + known_board])
 
-    for _ in range(num_sims):
-        deck = Deck()
-        deck.shuffle()
+    # Without a tolerance every runout is drawn and evaluated in one batch;
+    # hero, villain and known board cards are excluded up front
+    batch_size = num_sims if tol is None else CHECK_SIMS
+    wins = ties = sims = 0
 
-        # Remove hero, villain, and known board cards
-        all_known = hero_hand + villain_hand + known_board
-        for card in all_known:
-            for i, deck_card in enumerate(deck._cards):
-                if deck_card.rank == card.rank and deck_card.suit == card.suit:
-                    deck._cards.pop(i)
-                    break
+    while sims < num_sims:
+        n = min(batch_size, num_sims - sims)
+        runouts = sample_boards(excluded, n, cards_needed, rng)
+        hero_strength = finalize_many(hero_state, runouts)
+        villain_strength = finalize_many(villain_state, runouts)
 
-        # Complete the board
-        remaining_board = [deck.deal_one() for _ in range(cards_needed)]
-        full_board = known_board + remaining_board
+        wins += np.count_nonzero(hero_strength > villain_strength)
+        ties += np.count_nonzero(hero_strength == villain_strength)
+        sims += n
 
-        # Evaluate
-        hero_strength = evaluate(hero_hand + full_board)
-        villain_strength = evaluate(villain_hand + full_board)
+        if tol is not None:
+            # Per-sim score is 1, 0.5 or 0 (squared: 1, 0.25 or 0)
+            if within_tolerance(wins + 0.5 * ties, wins + 0.25 * ties, sims, tol):
+                break
 
-        if hero_strength > villain_strength:
-            total_score += 1.0
-        elif hero_strength == villain_strength:
-            total_score += 0.5
+    return (wins + 0.5 * ties) / sims
 
-    return total_score / num_sims
+
+# Exact (river) and seeded results are deterministic for a canonical spot
+_equity_vs_hand_cached = lru_cache(maxsize=1 << 16)(_equity_vs_hand)
 
 
 def compute_multiway_equity(
@@ -158,42 +154,82 @@ def compute_multiway_equity(
 
     Returns:
         Equity as a float between 0 and 1 (e.g., 0.35 = 35% equity)
+
+    Raises:
+        ValueError: If num_opponents is less than 1
     '''
+    return _equity_vs_random(hand_class, num_opponents, num_sims, seed)
 
 
-    if seed is not None:
-        random.seed(seed)
+def compute_equity_curve(
+        hand_class: str,
+        max_opponents: int = 5,
+        num_sims: int = 50_000,
+        seed: int = None
+) -> np.ndarray:
+    """
+    Compute a hand class's equity against 1 up to max_opponents random hands.
 
-    total_score = 0.0
+    Every opponent count is scored on the same simulations: max_opponents
+    hands and a board are dealt once, and the equity against k opponents
+    only looks at the first k of them. Entry k - 1 therefore equals
+    compute_multiway_equity(hand_class, k, num_sims, seed) for
+    k == max_opponents and is an equally good estimate for smaller k.
 
-    for _ in range(num_sims):
-        deck = Deck()
-        deck.shuffle()
+    Args:
+        hand_class: Hand class like "AA", "AKs", "72o"
+        max_opponents: Largest number of opponents
+        num_sims: Number of Monte Carlo simulations
+        seed: Optional random seed
 
-        hero_hand = sample_hand_from_class(hand_class, excluded_cards=[])
+    Returns:
+        (max_opponents,) array where entry k - 1 is the equity against k opponents
 
-        for card in hero_hand:
-            for i, deck_card in enumerate(deck._cards):
-                if deck_card.rank == card.rank and deck_card.suit == card.suit:
-                    deck._cards.pop(i)
-                    break
+    Raises:
+        ValueError: If max_opponents is less than 1
+    """
+    return _equity_curve(hand_class, max_opponents, num_sims, seed)
 
-        opponent_hands = []
-        for _ in range(num_opponents):
-            opponent_hand = [deck.deal_one(), deck.deal_one()]
-            opponent_hands.append(opponent_hand)
 
-        board = [deck.deal_one() for _ in range(5)]
+def _equity_vs_random(hand_class: str, num_opponents: int, num_sims: int, seed: int) -> float:
+    """Hand-class equity against num_opponents random hands."""
+    return float(_equity_curve(hand_class, num_opponents, num_sims, seed)[-1])
 
-        hero_strength = evaluate(hero_hand + board)
-        opponent_strengths = [evaluate(opp_hand + board) for opp_hand in opponent_hands]
 
-        all_strengths = [hero_strength] + opponent_strengths
-        max_strength = max(all_strengths)
-        winners = [i for i, s in enumerate(all_strengths) if s == max_strength]
+def _equity_curve(hand_class: str, max_opponents: int, num_sims: int, seed: int) -> np.ndarray:
+    """
+    Equity against 1..max_opponents random hands, simulated in batches.
 
-        if 0 in winners:
-            equity_per_winner = 1.0 / len(winners)
-            total_score += equity_per_winner
+    The private NumPy generator never touches the global random state, so
+    concurrent calls (threads or processes) stay independent.
+    """
+    if max_opponents < 1:
+        raise ValueError(f"Need at least 1 opponent, got {max_opponents}")
+
+    rng = np.random.default_rng(seed)
+    total_score = np.zeros(max_opponents)
+    cards_dealt = 2 * max_opponents + 5
+
+    # Every simulation's hero hand in one draw; simulations that share a
+    # combo are dealt and evaluated together
+    hero_hands = sample_hands_batch(hand_class, num_sims, rng=rng)
+    combos, combo_counts = np.unique(hero_hands, axis=0, return_counts=True)
+
+    for (hero_0, hero_1), count in zip(combos.tolist(), combo_counts.tolist()):
+        # Opponents' hole cards in pairs, then the board in the last 5 columns
+        dealt = sample_boards((1 << hero_0) | (1 << hero_1), count, cards_dealt, rng)
+        board = dealt[:, 2 * max_opponents:]
+
+        hero = finalize_many(partial_state([hero_0, hero_1]), board)
+        opponents = np.empty((count, max_opponents), dtype=np.int64)
+        for j in range(max_opponents):
+            opponents[:, j] = evaluate_many(np.hstack([dealt[:, 2 * j:2 * j + 2], board]))
+
+        # Column k - 1: best of the first k opponents and how many of them
+        # tie hero. Hero's share of each pot is 1, 1/(ties + 1) or 0.
+        best = np.maximum.accumulate(opponents, axis=1)
+        ties = np.cumsum(opponents == hero[:, None], axis=1)
+        share = np.where(hero[:, None] > best, 1.0, (hero[:, None] == best) / (ties + 1))
+        total_score += share.sum(axis=0)
 
-    return total_score / num_sims
\ No newline at end of file
+    return total_score / num_sims
@@ -1,7 +1,21 @@
-from typing import List
+from typing import List, Sequence
 import eval7
+import numpy as np
 from src.deck import Card
 
+try:
+    from numba import njit
+except ImportError:  # evaluate_many() falls back to the NumPy implementation
+    njit = None
+
+
+# eval7 cards built once and indexed by Card.idx, so evaluate() never
+# formats strings or allocates cards
+EVAL7_CARDS = tuple(
+    eval7.Card(card.rank + card.suit)
+    for card in (Card.from_idx(i) for i in range(52))
+)
+
 
 def evaluate(cards: List[Card]) -> int:
     """
@@ -19,9 +33,276 @@ def evaluate(cards: List[Card]) -> int:
     if len(cards) != 7:
         raise ValueError(f"Expected exactly 7 cards, got {len(cards)}")
 
-    eval7_cards = [eval7.Card(f"{c.rank}{c.suit}") for c in cards]
+    return evaluate_idx([c.idx for c in cards])
+
+
+def evaluate_idx(indices: Sequence[int]) -> int:
+    """
+    Evaluate a 7-card poker hand given as Card.idx integers.
+
+    Unchecked fast path for simulation loops that already work on card
+    indices; use evaluate() for Card input and length validation.
+    """
+    return eval7.evaluate([EVAL7_CARDS[i] for i in indices])
+
+
+# Evaluates a list of 7 EVAL7_CARDS entries directly. Simulation loops build
+# one such list per board and overwrite the two hole-card slots for each
+# player, instead of concatenating and translating a new hand every time.
+evaluate_eval7 = eval7.evaluate
+
+
+def _top5(mask: int) -> int:
+    """Pack the five highest rank bits of mask into eval7's kicker nibbles."""
+    value, shift = 0, 16
+    for rank in range(12, -1, -1):
+        if mask >> rank & 1 and shift >= 0:
+            value |= rank << shift
+            shift -= 4
+    return value
+
+
+def _straight_top(mask: int) -> int:
+    """Highest rank of a straight in mask, or -1 if there is none."""
+    for top in range(12, 3, -1):
+        if (mask >> (top - 4)) & 0b11111 == 0b11111:
+            return top
+    # Wheel: A-2-3-4-5 plays as a five-high straight
+    if mask & 0b1000000001111 == 0b1000000001111:
+        return 3
+    return -1
+
+
+# Lookup tables over 13-bit rank masks (bit r = rank r, with 2 = 0 ... A = 12)
+_TOP5 = np.array([_top5(m) for m in range(1 << 13)], dtype=np.int64)
+_STRAIGHT_TOP = np.array([_straight_top(m) for m in range(1 << 13)], dtype=np.int64)
+_RANK_BITS = 1 << np.arange(13, dtype=np.int64)
+
+
+def partial_state(cards_idx: Sequence[int]) -> np.ndarray:
+    """
+    Summarize up to 7 cards so the rest of the hand can be added later.
+
+    Build one state per player from their hole cards plus the known board,
+    then score every runout with finalize_many() instead of re-inserting
+    all seven cards for each one.
+
+    Args:
+        cards_idx: Distinct Card.idx integers (at most 7)
+
+    Returns:
+        (12,) int64 array: rank masks of ranks seen at least 1, 2, 3 and 4
+        times, then the rank mask and the card count of each suit
+
+    Raises:
+        ValueError: If more than 7 cards are given
+    """
+    cards = np.asarray(cards_idx, dtype=np.int64)
+    if len(cards) > 7:
+        raise ValueError(f"Expected at most 7 cards, got {len(cards)}")
+
+    ranks = 12 - cards // 4
+    suits = cards & 3
+    counts = np.bincount(ranks, minlength=13)
+    state = np.zeros(12, dtype=np.int64)
+    for level in range(4):
+        state[level] = (counts > level) @ _RANK_BITS
+    for suit in range(4):
+        state[4 + suit] = (1 << ranks[suits == suit]).sum()
+    state[8:] = np.bincount(suits, minlength=4)
+    return state
+
+
+_EMPTY_STATE = np.zeros(12, dtype=np.int64)
+
+
+def _finalize_scalar(state, cards, top5, straight_top):
+    """
+    Add cards to a partial_state() and evaluate the completed 7-card hand.
+
+    Mirrors _finalize_many_numpy() one hand at a time with bit masks only;
+    compiled by Numba when it is installed. The highest rank in a mask is
+    top5[mask] >> 16.
+    """
+    seen, pairs, trips, quads = state[0], state[1], state[2], state[3]
+    suit_masks = [state[4], state[5], state[6], state[7]]
+    suit_counts = [state[8], state[9], state[10], state[11]]
+    for i in range(len(cards)):
+        card = cards[i]
+        bit = 1 << (12 - card // 4)
+        suit = card & 3
+        suit_masks[suit] |= bit
+        suit_counts[suit] += 1
+        if trips & bit:
+            quads |= bit
+        elif pairs & bit:
+            trips |= bit
+        elif seen & bit:
+            pairs |= bit
+        seen |= bit
+
+    flush_mask = 0
+    for suit in range(4):
+        if suit_counts[suit] >= 5:
+            flush_mask = suit_masks[suit]
+    if flush_mask and straight_top[flush_mask] >= 0:
+        return 8 << 24 | straight_top[flush_mask] << 16
+
+    if quads:
+        quad = top5[quads] >> 16
+        return 7 << 24 | quad << 16 | (top5[seen & ~(1 << quad)] >> 4) & 0xF000
+
+    trips_only = trips & ~quads
+    pairs_only = pairs & ~trips
+    if trips_only:
+        trip = top5[trips_only] >> 16
+        full_of = (trips_only & ~(1 << trip)) | pairs_only
+        if full_of:
+            return 6 << 24 | trip << 16 | (top5[full_of] >> 16) << 12
+
+    if flush_mask:
+        return 5 << 24 | top5[flush_mask]
+    if straight_top[seen] >= 0:
+        return 4 << 24 | straight_top[seen] << 16
+
+    if trips_only:
+        return 3 << 24 | trip << 16 | (top5[seen & ~(1 << trip)] >> 4) & 0xFF00
+
+    if pairs_only:
+        high = top5[pairs_only] >> 16
+        rest = pairs_only & ~(1 << high)
+        if rest:
+            low = top5[rest] >> 16
+            kickers = seen & ~(1 << high) & ~(1 << low)
+            return 2 << 24 | high << 16 | low << 12 | (top5[kickers] >> 8) & 0xF00
+        return 1 << 24 | high << 16 | (top5[seen & ~(1 << high)] >> 4) & 0xFFF0
+
+    return top5[seen]
+
+
+def _evaluate_one_scalar(hand, top5, straight_top):
+    """Evaluate one 7-card hand of Card.idx integers with _finalize_scalar()."""
+    return _finalize_scalar(_EMPTY_STATE, hand, top5, straight_top)
+
+
+if njit is not None:
+    _finalize_jit = njit(cache=True)(_finalize_scalar)
+
+    @njit(cache=True)
+    def _finalize_many_jit(state, cards, top5, straight_top):
+        out = np.empty(cards.shape[0], dtype=np.int64)
+        for i in range(cards.shape[0]):
+            out[i] = _finalize_jit(state, cards[i], top5, straight_top)
+        return out
+
+
+def evaluate_many(hands_idx: np.ndarray) -> np.ndarray:
+    """
+    Evaluate a batch of 7-card hands given as Card.idx integers.
+
+    Returns exactly the values eval7.evaluate() would, so results can be
+    mixed freely with evaluate() and evaluate_idx(). Runs a Numba-compiled
+    loop when numba is installed and vectorized NumPy otherwise.
+
+    Args:
+        hands_idx: (N, 7) integer array of card indices, distinct per row
+
+    Returns:
+        (N,) int64 array where HIGHER = STRONGER
+    """
+    hands_idx = np.ascontiguousarray(hands_idx, dtype=np.int64)
+    if hands_idx.ndim != 2 or hands_idx.shape[1] != 7:
+        raise ValueError(f"Expected an (N, 7) array, got shape {hands_idx.shape}")
+
+    return _finalize_many(_EMPTY_STATE, hands_idx)
+
+
+def finalize_many(state: np.ndarray, cards_idx: np.ndarray) -> np.ndarray:
+    """
+    Evaluate a batch of hands that share the cards summarized in state.
+
+    Equivalent to evaluate_many() on the shared cards followed by each row
+    of cards_idx, but only the row's cards are inserted per hand.
+
+    Args:
+        state: partial_state() of the shared cards
+        cards_idx: (N, 7 - shared) integer array of the remaining card
+            indices, distinct per row and from the shared cards
+
+    Returns:
+        (N,) int64 array where HIGHER = STRONGER
+    """
+    cards_idx = np.ascontiguousarray(cards_idx, dtype=np.int64)
+    missing = 7 - int(state[8:].sum())
+    if cards_idx.ndim != 2 or cards_idx.shape[1] != missing:
+        raise ValueError(f"Expected an (N, {missing}) array, got shape {cards_idx.shape}")
+    return _finalize_many(state, cards_idx)
+
+
+def _finalize_many(state: np.ndarray, cards_idx: np.ndarray) -> np.ndarray:
+    """Dispatch finalize_many() to Numba or NumPy, on validated input."""
+    if njit is not None:
+        return _finalize_many_jit(state, cards_idx, _TOP5, _STRAIGHT_TOP)
+    return _finalize_many_numpy(state, cards_idx)
+
+
+def _evaluate_many_numpy(hands_idx: np.ndarray) -> np.ndarray:
+    """evaluate_many() with NumPy array operations, on validated input."""
+    return _finalize_many_numpy(_EMPTY_STATE, hands_idx)
+
+
+def _finalize_many_numpy(state: np.ndarray, cards_idx: np.ndarray) -> np.ndarray:
+    """finalize_many() with NumPy array operations, on validated input."""
+    ranks = 12 - cards_idx // 4  # eval7 ranks: 2 = 0 ... A = 12
+    suits = cards_idx & 3
+    bits = 1 << ranks
+
+    # Per-rank counts of the shared cards are the number of masks holding the rank
+    rows = np.arange(len(cards_idx))[:, None]
+    base_counts = ((state[:4, None] >> np.arange(13)) & 1).sum(axis=0)
+    counts = base_counts + np.bincount(
+        (rows * 13 + ranks).ravel(), minlength=len(cards_idx) * 13).reshape(-1, 13)
+    rank_mask = (counts > 0) @ _RANK_BITS
+
+    # At most one suit can hold five of seven cards
+    suit_counts = state[8:] + np.bincount(
+        (rows * 4 + suits).ravel(), minlength=len(cards_idx) * 4).reshape(-1, 4)
+    flush_suit = suit_counts.argmax(axis=1)
+    has_flush = suit_counts.max(axis=1) >= 5
+    flush_mask = state[4 + flush_suit] | (bits * (suits == flush_suit[:, None])).sum(axis=1)
+
+    # Rank groups ordered by (count, rank), largest first
+    keys = np.where(counts > 0, counts * 16 + np.arange(13), -1)
+    keys.sort(axis=1)
+    c0, r0 = keys[:, -1] >> 4, keys[:, -1] & 15
+    c1, r1 = keys[:, -2] >> 4, keys[:, -2] & 15
+    rest0 = rank_mask & ~(1 << r0)
+    rest01 = rest0 & ~(1 << r1)
+
+    straight_flush_top = _STRAIGHT_TOP[flush_mask]
+    straight_top = _STRAIGHT_TOP[rank_mask]
 
-    return eval7.evaluate(eval7_cards)
+    conditions = [
+        has_flush & (straight_flush_top >= 0),
+        c0 == 4,
+        (c0 == 3) & (c1 >= 2),
+        has_flush,
+        straight_top >= 0,
+        c0 == 3,
+        (c0 == 2) & (c1 == 2),
+        c0 == 2,
+    ]
+    values = [
+        8 << 24 | straight_flush_top << 16,
+        7 << 24 | r0 << 16 | (_TOP5[rest0] >> 4) & 0xF000,
+        6 << 24 | r0 << 16 | r1 << 12,
+        5 << 24 | _TOP5[flush_mask],
+        4 << 24 | straight_top << 16,
+        3 << 24 | r0 << 16 | (_TOP5[rest0] >> 4) & 0xFF00,
+        2 << 24 | r0 << 16 | r1 << 12 | (_TOP5[rest01] >> 8) & 0xF00,
+        1 << 24 | r0 << 16 | (_TOP5[rest0] >> 4) & 0xFFF0,
+    ]
+    return np.select(conditions, values, default=_TOP5[rank_mask])
 
 
 def handtype(cards: List[Card]) -> str:
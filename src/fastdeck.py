@@ -0,0 +1,81 @@
+from typing import Iterable, List
+import numpy as np
+from src.deck import Card
+
+
+# Simulations run with a tolerance stop once the 95% confidence half-width
+# (Z * standard error) drops below it
+Z = 1.96
+
+
+def card_mask(cards: Iterable[Card]) -> int:
+    """
+    Build a 52-bit mask with one bit set per card.
+
+    Args:
+        cards: Card objects
+
+    Returns:
+        Integer bitmask where bit i is set if a card with Card.idx == i is in cards
+    """
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.idx
+    return mask
+
+
+def live_indices(excluded_mask: int = 0) -> List[int]:
+    """List the card indices not set in excluded_mask."""
+    return [i for i in range(52) if not (excluded_mask >> i) & 1]
+
+
+def sample_boards(excluded_mask: int, num_boards: int, n: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Sample many independent n-card draws at once with NumPy.
+
+    Each row runs a partial Fisher-Yates shuffle over its own copy of the
+    live cards, vectorized across rows: only the first n positions are
+    swapped, so each draw costs n random integers per row rather than a
+    full shuffle of the deck.
+
+    Args:
+        excluded_mask: Bitmask of cards that must not be drawn
+        num_boards: Number of rows to sample
+        n: Cards per row
+        rng: NumPy random Generator
+
+    Returns:
+        (num_boards, n) uint8 array of card indices, distinct within each row
+    """
+    available = np.array(live_indices(excluded_mask), dtype=np.uint8)
+    if n > len(available):
+        raise ValueError(f"Not enough cards left to draw {n}")
+    if n == 0:
+        return np.empty((num_boards, 0), dtype=np.uint8)
+
+    decks = np.tile(available, (num_boards, 1))
+    rows = np.arange(num_boards)
+    for k in range(n):
+        j = rng.integers(k, len(available), size=num_boards)
+        picked = decks[rows, j]
+        decks[rows, j] = decks[:, k]
+        decks[:, k] = picked
+    return decks[:, :n]
+
+
+def within_tolerance(payout_sum, payout_sq_sum, num_sims: int, tol: float) -> bool:
+    """
+    Check whether Monte Carlo mean payouts are known to within tol.
+
+    Args:
+        payout_sum: Sum of per-simulation payouts, a scalar or one per player
+        payout_sq_sum: Sum of squared per-simulation payouts, same shape
+        num_sims: Number of simulations summed
+        tol: Target 95% confidence half-width
+
+    Returns:
+        True if Z times the standard error of every mean is below tol
+    """
+    mean = np.asarray(payout_sum) / num_sims
+    variance = np.maximum(np.asarray(payout_sq_sum) / num_sims - mean * mean, 0.0)
+    return bool(np.all(Z * np.sqrt(variance / num_sims) < tol))
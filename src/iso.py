@@ -0,0 +1,54 @@
+from typing import Dict, List, Sequence, Tuple
+from src.deck import ALL_CARDS, Card, SUITS, RANKS
+
+
+_RANK_ORDER = {rank: i for i, rank in enumerate(RANKS)}
+
+
+def canonicalize(
+        hero: Sequence[Card],
+        villain: Sequence[Card],
+        board: Sequence[Card]
+) -> Tuple[Tuple[Card, ...], Tuple[Card, ...], Tuple[Card, ...], Dict[str, str]]:
+    """
+    Relabel suits so that suit-isomorphic spots map to the same cards.
+
+    Equity does not change when suits are permuted consistently across all
+    cards, e.g. AsKs vs AhKh on Ks7d2h is the same spot as AhKh vs AsKs on
+    Kh7c2d. Suits are renamed in order of first appearance ('s', 'h', 'd',
+    'c') walking hero, villain, then board, each group sorted by rank.
+
+    Args:
+        hero: Hero's hole cards
+        villain: Villain's hole cards
+        board: Known board cards
+
+    Returns:
+        (canon_hero, canon_villain, canon_board, perm) where each canonical
+        group is a tuple sorted by Card.idx and perm maps original suit to
+        canonical suit
+    """
+    groups = [
+        sorted(group, key=lambda c: _RANK_ORDER[c.rank])
+        for group in (hero, villain, board)
+    ]
+
+    perm: Dict[str, str] = {}
+    for group in groups:
+        for card in group:
+            if card.suit not in perm:
+                perm[card.suit] = SUITS[len(perm)]
+
+    # Suits that never appear still get a label, so perm is a full permutation
+    for suit in SUITS:
+        if suit not in perm:
+            perm[suit] = SUITS[len(perm)]
+
+    # Relabel through card indices (rank * 4 + suit) onto the shared Card
+    # instances rather than constructing new Cards
+    suit_map = [SUITS.index(perm[suit]) for suit in SUITS]
+    canon: List[Tuple[Card, ...]] = [
+        tuple(sorted((ALL_CARDS[c.idx - (c.idx & 3) + suit_map[c.idx & 3]] for c in group), key=lambda c: c.idx))
+        for group in groups
+    ]
+    return canon[0], canon[1], canon[2], perm
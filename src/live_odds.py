@@ -1,25 +1,168 @@
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import List, Dict, Optional, Tuple
+import os
 import random
-from src.deck import Deck, Card
-from src.evaluator import evaluate
+import numpy as np
+from src.deck import Card
+from src.evaluator import EVAL7_CARDS, evaluate_eval7, finalize_many, partial_state
+from src.fastdeck import card_mask, live_indices, sample_boards, within_tolerance
+from src.parsing import parse_card_string, parse_cards_string  # noqa: F401 (re-exported)
+
+
+# Simulations per shard. Runs with more than one shard are spread over a
+# process pool; the shard count depends only on num_sims, so a given seed
+# produces the same result regardless of how many CPUs are available.
+SHARD_SIMS = 10_000
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the module-level process pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _executor
+
+
+def _simulate_shard(
+        player_cards: np.ndarray,
+        board: List[int],
+        dead_mask: int,
+        num_sims: int,
+        seed: int,
+        capture_boards: bool = False
+) -> Tuple[np.ndarray, Optional[List[List[int]]]]:
+    """
+    Run one shard of the Monte Carlo simulation on card indices.
+
+    Module-level so it can be sent to worker processes.
+
+    Args:
+        player_cards: (num_active, 2) hole card indices of the active players
+        board: Known board card indices
+        dead_mask: Bitmask of every known card (including folded hands)
+        num_sims: Number of simulations in this shard
+        seed: Seed for this shard's NumPy Generator
+        capture_boards: Also return every simulated board
+
+    Returns:
+        (strengths, captured_boards) where strengths is a
+        (num_sims, len(player_cards)) array of hand values per simulated board
+    """
+    # Every runout in one (num_sims, cards_needed) draw
+    rng = np.random.default_rng(seed)
+    runouts = sample_boards(dead_mask, num_sims, 5 - len(board), rng)
+    return _runout_strengths(player_cards, board, runouts, capture_boards)
+
+
+def _runout_strengths(
+        player_cards: np.ndarray,
+        board: List[int],
+        runouts: np.ndarray,
+        capture_boards: bool = False
+) -> Tuple[np.ndarray, Optional[List[List[int]]]]:
+    """
+    Complete each runout to a 5-card board and evaluate every player on it.
+
+    Returns:
+        (strengths, captured_boards) where strengths is a
+        (len(runouts), len(player_cards)) array of hand values
+    """
+    # Each player's hole cards and the known board are summarized once;
+    # only the runout cards are added per board
+    strengths = np.empty((len(runouts), len(player_cards)), dtype=np.int64)
+    for pos, hand in enumerate(player_cards):
+        strengths[:, pos] = finalize_many(partial_state(hand.tolist() + board), runouts)
+
+    captured_boards = None
+    if capture_boards:
+        boards = np.hstack([np.tile(np.array(board, dtype=np.uint8), (len(runouts), 1)), runouts])
+        captured_boards = boards.tolist()
+    return strengths, captured_boards
+
+
+def _tally(strengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Score simulated showdowns from a (num_sims, num_players) strength array.
+
+    Returns:
+        (win_counts, outright_win_counts, split_count) where win_counts gives
+        split pots fractional credit and outright_win_counts only counts
+        boards won alone
+    """
+    winners = strengths == strengths.max(axis=1, keepdims=True)
+    num_winners = winners.sum(axis=1)
+    win_counts = (winners / num_winners[:, None]).sum(axis=0)
+    outright_win_counts = winners[num_winners == 1].sum(axis=0)
+    split_count = int((num_winners > 1).sum())
+    return win_counts, outright_win_counts, split_count
+
+
+def _showdown_ranks(strengths: np.ndarray) -> np.ndarray:
+    """
+    Replace each hand value by how many players it beats on that board.
+
+    The counts order and tie exactly like the values within a row, so
+    _tally() gives the same result for any subset of columns, in an int8
+    array an eighth of the size.
+    """
+    return (strengths[:, :, None] > strengths[:, None, :]).sum(axis=2, dtype=np.int8)
+
+
+def _converged(strengths: np.ndarray, tol: float) -> bool:
+    """
+    True once every player's equity is known to within tol.
+
+    Each simulation pays a player 1, 1/k (k-way split) or 0.
+    """
+    winners = strengths == strengths.max(axis=1, keepdims=True)
+    shares = winners / winners.sum(axis=1)[:, None]
+    return within_tolerance(shares.sum(axis=0), (shares * shares).sum(axis=0), len(shares), tol)
+
+
+def _claim_cards(cards: List[Card], dead_mask: int) -> int:
+    """
+    Check new cards against a mask of known cards with bit operations.
+
+    Covers validate_unique_cards() and validate_rank_count() for the
+    calculator: bits are laid out rank by rank (Card.idx = rank * 4 + suit),
+    so distinct cards can never put more than 4 of a rank in the mask.
+
+    Returns:
+        dead_mask with the new cards added
+
+    Raises:
+        ValueError: If a card repeats or is already in dead_mask
+    """
+    for card in cards:
+        dead_mask = _claim_card(card, dead_mask)
+    return dead_mask
+
+
+def _claim_card(card: Card, dead_mask: int) -> int:
+    """_claim_cards() for a single card: one bit test and one bit set."""
+    bit = 1 << card.idx
+    if dead_mask & bit:
+        raise ValueError(f"Duplicate card: {card.rank}{card.suit}")
+    return dead_mask | bit
 
 
 def validate_unique_cards(all_cards: List[Card]):
-    seen = set()
-    for card in all_cards:
-        card_id = (card.rank, card.suit)
-        if card_id in seen:
-            raise ValueError(f"Duplicate card: {card.rank}{card.suit}")
-        seen.add(card_id)
+    _claim_cards(all_cards, 0)
 
 
 def validate_rank_count(all_cards: List[Card]):
-    from collections import Counter
-    rank_counts = Counter(card.rank for card in all_cards)
+    # Card.idx // 4 is the rank index, so a flat list replaces a Counter
+    rank_counts = [0] * 13
+    for card in all_cards:
+        rank_counts[card.idx >> 2] += 1
 
-    for rank, count in rank_counts.items():
+    for card in all_cards:
+        count = rank_counts[card.idx >> 2]
         if count > 4:
-            raise ValueError(f"Invalid: {count} cards of rank {rank} (max 4 allowed)")
+            raise ValueError(f"Invalid: {count} cards of rank {card.rank} (max 4 allowed)")
 
 
 class LiveOddsCalculator:
@@ -40,6 +183,13 @@ class LiveOddsCalculator:
         self.street = 'preflop'
         self.last_split_probability: float = 0.0  # Overall probability of any split
         self.last_player_split_probabilities: Dict[int, float] = {}  # Per-player split prob
+        # Card.idx mirrors of player_hands / board and a bitmask of every
+        # known card, kept in sync so simulations never touch Card objects
+        self._hole_idx = np.zeros((num_players, 2), dtype=np.int8)
+        self._board_idx: List[int] = []
+        self._dead_mask = 0
+        self.last_num_sims: int = 0  # Simulations actually run by the last Monte Carlo call
+        self._sample_cache: Optional[dict] = None  # Last simulation, re-scored after folds
 
     def add_player_hand(self, hand: List[Card]):
         if len(hand) != 2:
@@ -48,16 +198,11 @@ class LiveOddsCalculator:
         if len(self.player_hands) >= self.num_players:
             raise ValueError(f"Already have {self.num_players} players")
 
-        # Validate no duplicates within this hand
-        validate_unique_cards(hand)
-
-        # Validate no conflicts with already-added hands
-        all_known = self.get_all_known_cards()
-        validate_unique_cards(all_known + hand)
-
-        # Validate rank counts
-        validate_rank_count(all_known + hand)
+        # Validate no duplicates within this hand or with known cards
+        dead_mask = _claim_cards(hand, self._dead_mask)
 
+        self._hole_idx[len(self.player_hands)] = [hand[0].idx, hand[1].idx]
+        self._dead_mask = dead_mask
         self.player_hands.append(hand)
 
     def set_board(self, cards: List[Card]):
@@ -73,20 +218,14 @@ class LiveOddsCalculator:
         if len(cards) > 5:
             raise ValueError("Board cannot have more than 5 cards")
 
-        # Validate no duplicates within board
-        validate_unique_cards(cards)
-
-        # Validate no conflicts with player hands
-        all_known = self.get_all_known_cards()
-        all_with_new_board = []
-        for hand in self.player_hands:
-            all_with_new_board.extend(hand)
-        all_with_new_board.extend(cards)
-
-        validate_unique_cards(all_with_new_board)
-        validate_rank_count(all_with_new_board)
+        # Validate no duplicates within board or with player hands
+        hands_mask = self._dead_mask & ~card_mask(self.board)
+        dead_mask = _claim_cards(cards, hands_mask)
 
         self.board = cards
+        self._board_idx = [c.idx for c in cards]
+        self._dead_mask = dead_mask
+        self._sample_cache = None
 
         # Update street name
         if len(cards) == 0:
@@ -110,24 +249,42 @@ class LiveOddsCalculator:
             raise ValueError("Must deal flop before turn")
 
         # Validate card doesn't conflict
-        all_known = self.get_all_known_cards()
-        validate_unique_cards(all_known + [card])
-        validate_rank_count(all_known + [card])
+        self._dead_mask = _claim_card(card, self._dead_mask)
 
         self.board.append(card)
+        self._board_idx.append(card.idx)
         self.street = 'turn'
+        self._sample_cache = None
 
     def deal_river(self, card: Card):
         if len(self.board) != 4:
             raise ValueError("Must deal turn before river")
 
         # Validate card doesn't conflict
-        all_known = self.get_all_known_cards()
-        validate_unique_cards(all_known + [card])
-        validate_rank_count(all_known + [card])
+        self._dead_mask = _claim_card(card, self._dead_mask)
 
         self.board.append(card)
+        self._board_idx.append(card.idx)
         self.street = 'river'
+        self._sample_cache = None
+
+    def copy(self) -> 'LiveOddsCalculator':
+        """
+        Copy hands, board, folds and the last simulation's samples.
+
+        Folding players on the copy leaves this calculator untouched, and the
+        copy can still re-score the shared samples instead of simulating.
+        """
+        other = LiveOddsCalculator(self.num_players)
+        other.player_hands = [list(hand) for hand in self.player_hands]
+        other.board = list(self.board)
+        other.folded_players = set(self.folded_players)
+        other.street = self.street
+        other._hole_idx = self._hole_idx.copy()
+        other._board_idx = list(self._board_idx)
+        other._dead_mask = self._dead_mask
+        other._sample_cache = self._sample_cache
+        return other
 
     def get_all_known_cards(self) -> List[Card]:
         known = []
@@ -174,16 +331,23 @@ class LiveOddsCalculator:
         # Fold the player
         self.folded_players.add(player_idx)
 
-    def calculate_equities(self, num_sims: int = 10_000, seed: int = None, debug: bool = False, capture_boards: bool = False) -> Dict[int, float]:
+    def calculate_equities(self, num_sims: int = 10_000, seed: int = None, debug: bool = False, capture_boards: bool = False, tol: float = None) -> Dict[int, float]:
         """
         Calculate win probability for each player.
 
         Folded players receive 0% equity. Their cards are excluded from the deck
         but still tracked (they cannot appear on future streets).
 
+        From the flop on, every remaining runout is enumerated exactly and
+        num_sims, seed and tol are ignored; preflop uses Monte Carlo.
+
         Args:
-            num_sims: Number of Monte Carlo simulations
+            num_sims: Number of Monte Carlo simulations (an upper bound when tol is set)
             seed: Random seed for reproducibility
+            tol: Stop early once every player's 95% confidence half-width is
+                below tol (e.g. 0.005), checked every SHARD_SIMS simulations;
+                None always runs num_sims.
+                last_num_sims records how many simulations were used.
 
         Returns:
             Dict mapping player index to equity (0.0-1.0)
@@ -214,64 +378,51 @@ class LiveOddsCalculator:
 
             return equities
 
-        if seed is not None:
-            random.seed(seed)
-
         # If river is complete, calculate exactly
-        if len(self.board) == 5:
-            return self._calculate_exact_equities()
-
-        # Monte Carlo simulation (only for active players)
-        win_counts = [0.0] * self.num_players  # For equity calculation
-        outright_win_counts = [0.0] * self.num_players  # For outcome display
-        split_count = 0  # Track total splits
-        cards_needed = 5 - len(self.board)
-
-        captured_boards = [] if capture_boards else None
-
-        # Pre-compute known cards (includes folded players' cards!)
-        known_cards_set = set((c.rank, c.suit) for c in self.get_all_known_cards())
-
-        for sim_idx in range(num_sims):
-            # Create and shuffle deck
-            deck = Deck()
-            deck.shuffle()
-
-            # Remove known cards efficiently (includes folded hands)
-            available_cards = [c for c in deck._cards if (c.rank, c.suit) not in known_cards_set]
-
-            # Deal board from available cards
-            remaining_board = available_cards[:cards_needed]
-            full_board = self.board + remaining_board
-
-            # Capture board if requested (for testing)
-            if capture_boards:
-                captured_boards.append(full_board[:])  # Copy the board
-
-            # Evaluate only active players' hands
-            strengths = {}
-            for player_idx in active_players:
-                player_hand = self.player_hands[player_idx]
-                strength = evaluate(player_hand + full_board)
-                strengths[player_idx] = strength
-
-
-            max_strength = max(strengths.values())
-            winners = [i for i, s in strengths.items() if s == max_strength]
-
-            # Track outcomes
-            if len(winners) > 1:
-                # Split pot
-                split_count += 1
+        if self.street == 'river':
+            return self.river_equities()
+
+        board = list(self._board_idx)
+
+        # After a fold the deck is unchanged (folded cards stay dead), so the
+        # boards sampled for the previous call can be re-scored for the
+        # remaining players instead of simulating again. Enumerated runouts
+        # do not depend on num_sims, seed or tol, so only sampled ones key on them.
+        enumerate_runouts = len(board) >= 3
+        params = None if enumerate_runouts else (num_sims, seed, tol)
+        cache = self._sample_cache
+        if (cache is not None and not capture_boards
+                and cache['board'] == tuple(board)
+                and cache['params'] == params
+                and set(active_players) < set(cache['players'])):
+            columns = [cache['players'].index(i) for i in active_players]
+            strengths = cache['ranks'][:, columns]
+            captured_boards = None
+        else:
+            if enumerate_runouts:
+                # Two or fewer cards to come: every runout is cheaper than sampling
+                strengths, captured_boards = self._enumerate(active_players, board, capture_boards)
             else:
-                # Outright win
-                outright_win_counts[winners[0]] += 1
-
-            # Award equity (for equity calculation)
-            equity_per_winner = 1.0 / len(winners)
-            for winner_idx in winners:
-                win_counts[winner_idx] += equity_per_winner
-
+                strengths, captured_boards = self._simulate(
+                    active_players, board, num_sims, random.Random(seed), capture_boards, tol)
+            self._sample_cache = {
+                'board': tuple(board),
+                'params': params,
+                'players': active_players,
+                'ranks': _showdown_ranks(strengths),
+            }
+
+        # With a tolerance fewer than num_sims simulations may have run
+        num_sims = len(strengths)
+        self.last_num_sims = num_sims
+
+        # Map per-column counts back to player indices
+        column_wins, column_outright, split_count = _tally(strengths)
+        win_counts = [0.0] * self.num_players
+        outright_win_counts = [0] * self.num_players
+        for pos, player_idx in enumerate(active_players):
+            win_counts[player_idx] = float(column_wins[pos])
+            outright_win_counts[player_idx] = int(column_outright[pos])
 
         equities = {}
         for i in range(self.num_players):
@@ -298,22 +449,108 @@ class LiveOddsCalculator:
 
 
 
-    def _calculate_exact_equities(self) -> Dict[int, float]:
-        """Calculate exact equities when all 5 board cards are known."""
-        active_players = self.get_active_players()
+    def _enumerate(
+            self,
+            active_players: List[int],
+            board: List[int],
+            capture_boards: bool
+    ) -> Tuple[np.ndarray, Optional[List[List[Card]]]]:
+        """
+        Evaluate every possible runout exactly (turn and river, or river only).
 
-        # If only 1 active player, they have 100%
-        if len(active_players) == 1:
-            equities = {i: 0.0 for i in range(self.num_players)}
-            equities[active_players[0]] = 1.0
-            return equities
+        Returns:
+            (strengths, captured_boards) like _simulate(), with one row per runout
+        """
+        live = live_indices(self._dead_mask)
+        runouts = np.array(list(combinations(live, 5 - len(board))), dtype=np.uint8)
+        strengths, boards = _runout_strengths(self._hole_idx[active_players], board, runouts, capture_boards)
+        captured_boards = None
+        if capture_boards:
+            captured_boards = [[Card.from_idx(i) for i in full_board] for full_board in boards]
+        return strengths, captured_boards
+
+    def _simulate(
+            self,
+            active_players: List[int],
+            board: List[int],
+            num_sims: int,
+            rng: random.Random,
+            capture_boards: bool,
+            tol: float = None
+    ) -> Tuple[np.ndarray, Optional[List[List[Card]]]]:
+        """
+        Run the Monte Carlo simulation for the active players.
+
+        With a tolerance, shards run in waves of one per worker and the
+        estimate is checked after each shard; later waves are never run.
+
+        Returns:
+            (strengths, captured_boards) with one strengths column per active
+            player, in active_players order
+        """
+        # Known cards include folded players' cards!
+        player_cards = self._hole_idx[active_players]
+        dead_mask = self._dead_mask
+
+        # Split into shards, each seeded from rng
+        shard_sizes = [SHARD_SIMS] * (num_sims // SHARD_SIMS)
+        if num_sims % SHARD_SIMS:
+            shard_sizes.append(num_sims % SHARD_SIMS)
+        shard_seeds = [rng.getrandbits(64) for _ in shard_sizes]
+        shard_args = [
+            (player_cards, board, dead_mask, n, shard_seed, capture_boards)
+            for n, shard_seed in zip(shard_sizes, shard_seeds)
+        ]
+
+        workers = os.cpu_count() or 1
+        if len(shard_args) > 1 and workers > 1:
+            executor = _get_executor()
+            # With a tolerance, shards go out in waves of one per worker and
+            # the next wave is only submitted if the estimate hasn't converged
+            wave_size = len(shard_args) if tol is None else workers
+            waves = (
+                [executor.submit(_simulate_shard, *args) for args in shard_args[start:start + wave_size]]
+                for start in range(0, len(shard_args), wave_size)
+            )
+            results = (future.result() for wave in waves for future in wave)
+        else:
+            # One shard at a time, so shards after convergence are never simulated
+            results = (_simulate_shard(*args) for args in shard_args)
+
+        # Convergence is checked in shard order, so the result does not
+        # depend on how many workers ran them
+        shard_results = []
+        for result in results:
+            shard_results.append(result)
+            if tol is not None and _converged(np.concatenate([r[0] for r in shard_results]), tol):
+                break
+
+        strengths = np.concatenate([result[0] for result in shard_results])
+        captured_boards = None
+        if capture_boards:
+            captured_boards = [
+                [Card.from_idx(i) for i in full_board]
+                for _, shard_boards in shard_results for full_board in shard_boards
+            ]
+        return strengths, captured_boards
 
-        # Evaluate only active players
+    def river_equities(self) -> Dict[int, float]:
+        """
+        Exact equities once all 5 board cards are known.
+
+        No sampling: one evaluation per active player against the shared
+        board, then the pot goes to the best hand (split evenly on ties).
+        """
+        active_players = self.get_active_players()
+
+        # Board in slots 2-6, each player's hole cards written into slots 0-1
+        hand = [None, None] + [EVAL7_CARDS[i] for i in self._board_idx]
         strengths = {}
         for player_idx in active_players:
-            player_hand = self.player_hands[player_idx]
-            strength = evaluate(player_hand + self.board)
-            strengths[player_idx] = strength
+            hole_0, hole_1 = self._hole_idx[player_idx].tolist()
+            hand[0] = EVAL7_CARDS[hole_0]
+            hand[1] = EVAL7_CARDS[hole_1]
+            strengths[player_idx] = evaluate_eval7(hand)
 
         # Determine winner(s) among active players
         max_strength = max(strengths.values())
@@ -343,41 +580,3 @@ class LiveOddsCalculator:
 
         return equities
 
-
-def parse_card_string(card_str: str) -> Card:
-    if len(card_str) != 2:
-        if card_str.startswith('10'):  # just one obvious case where it just feels bad to type Th, not 10h
-            card_str = "T" + card_str[2]
-        else:
-            raise ValueError(f"Card string must be 2 characters, got: {card_str}")
-
-    rank = card_str[0].upper()
-    suit = card_str[1].lower()
-
-    valid_ranks = ['A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2']
-    valid_suits = ['s', 'h', 'd', 'c']
-
-    if rank not in valid_ranks:
-        raise ValueError(f"Invalid rank: {rank}")
-    if suit not in valid_suits:
-        raise ValueError(f"Invalid suit: {suit}")
-
-    return Card(rank, suit)
-
-
-def parse_cards_string(cards_str: str) -> List[Card]:
-    """
-    Parse a space-separated string of cards.
-
-    Args:
-        cards_str: Space-separated card strings (e.g., 'As Kh')
-
-    Returns:
-        List of Card objects
-
-    Examples:
-        'As Kh' -> [Card('A', 's'), Card('K', 'h')]
-        'Qd Qs' -> [Card('Q', 'd'), Card('Q', 's')]
-    """
-    card_strings = cards_str.strip().split()
-    return [parse_card_string(cs) for cs in card_strings]
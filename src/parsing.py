@@ -0,0 +1,64 @@
+from functools import lru_cache
+from typing import List, Tuple
+from src.deck import ALL_CARDS, Card, RANKS
+
+
+# Every accepted spelling (any case, '10' for tens) mapped to the shared Card
+_PARSE = {
+    r + s: card
+    for card in ALL_CARDS
+    for r in {card.rank, card.rank.lower()} | ({'10'} if card.rank == 'T' else set())
+    for s in {card.suit, card.suit.upper()}
+}
+
+
+def parse_card_string(card_str: str) -> Card:
+    card = _PARSE.get(card_str)
+    if card is not None:
+        return card
+
+    if len(card_str) != 2:
+        if card_str.startswith('10'):  # just one obvious case where it just feels bad to type Th, not 10h
+            card_str = "T" + card_str[2]
+        else:
+            raise ValueError(f"Card string must be 2 characters, got: {card_str}")
+
+    card = _PARSE.get(card_str)
+    if card is not None:
+        return card
+
+    rank = card_str[0].upper()
+    suit = card_str[1].lower()
+    if rank not in RANKS:
+        raise ValueError(f"Invalid rank: {rank}")
+    raise ValueError(f"Invalid suit: {suit}")
+
+
+def parse_cards_string(cards_str: str) -> List[Card]:
+    """
+    Parse a space-separated string of cards.
+
+    Results are cached on the whitespace-normalized string, so repeated
+    inputs (the web UI re-sends every hand on each click) skip parsing.
+
+    Args:
+        cards_str: Space-separated card strings (e.g., 'As Kh')
+
+    Returns:
+        List of Card objects (a fresh list, safe for the caller to mutate)
+
+    Examples:
+        'As Kh' -> [Card('A', 's'), Card('K', 'h')]
+        'Qd Qs' -> [Card('Q', 'd'), Card('Q', 's')]
+    """
+    return list(_parse_cards_cached(' '.join(cards_str.split())))
+
+
+@lru_cache(maxsize=4096)
+def _parse_cards_cached(normalized: str) -> Tuple[Card, ...]:
+    table = _PARSE
+    cards = tuple(table.get(cs) for cs in normalized.split())
+    if None in cards:
+        # Re-parse one by one for the specific error message
+        return tuple(parse_card_string(cs) for cs in normalized.split())
+    return cards
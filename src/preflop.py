@@ -1,11 +1,18 @@
 import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import List
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from tqdm import tqdm
 from src.equity import compute_multiway_equity
-from src.utils import get_combo_count, RANKS
+from src.utils import get_combo_count, ALL_HAND_CLASSES
+
+
+# Hand class of every grid cell
+_HAND_CLASS_GRID = np.array(ALL_HAND_CLASSES, dtype=object).reshape(13, 13)
 
 
 def generate_all_hand_classes() -> List[str]:
@@ -13,39 +20,34 @@ def generate_all_hand_classes() -> List[str]:
     Generate all 169 unique starting hand classes.
 
     Returns:
-        List of hand class strings
+        List of hand class strings (a fresh copy of ALL_HAND_CLASSES)
 
     Format:
         - Pairs: AA, KK, QQ, ..., 22
         - Suited: AKs, AQs, ..., 32s (upper triangle)
         - Offsuit: AKo, AQo, ..., 32o (lower triangle)
     """
-    hand_classes = []
-
-    for i, rank1 in enumerate(RANKS):
-        for j, rank2 in enumerate(RANKS):
-            if i < j:  # Suited (rank1 > rank2)
-                hand_classes.append(f"{rank1}{rank2}s")
-            elif i > j:  # Offsuit (rank1 < rank2, flip order)
-                hand_classes.append(f"{rank2}{rank1}o")
-            else:  # Pair
-                hand_classes.append(f"{rank1}{rank1}")
-
-    return hand_classes
+    return list(ALL_HAND_CLASSES)
 
 
 def compute_all_equities(
         num_players: int = 6,
         num_sims: int = 50_000,
-        seed: int = 42
+        seed: int = 42,
+        max_workers: int = None
 ) -> pd.DataFrame:
     """
     Compute multi-player equity for all 169 hand classes.
 
+    Hand classes are independent simulations, so they run in parallel
+    across worker processes.
+
     Args:
         num_players: Total number of players (default 6 for typical poker game)
         num_sims: Number of Monte Carlo simulations per hand
-        seed: Random seed for reproducibility
+        seed: Random seed for reproducibility; each hand class gets its
+            own seed derived from it
+        max_workers: Worker processes (default: os.cpu_count())
 
     Returns:
         DataFrame with columns: hand_class, equity, combos
@@ -54,17 +56,24 @@ def compute_all_equities(
     results = []
     num_opponents = num_players - 1
 
+    # Distinct per-hand seeds so hand classes don't share a random stream
+    if seed is None:
+        seeds = [None] * len(hand_classes)
+    else:
+        seed_rng = random.Random(seed)
+        seeds = [seed_rng.getrandbits(64) for _ in hand_classes]
+
     print(f"Computing equity for {len(hand_classes)} hand classes")
     print(f"Game type: {num_players}-player poker (1 vs {num_opponents} opponents)")
     print(f"Simulations per hand: {num_sims:,}\n")
 
-    for hand_class in tqdm(hand_classes, desc="Computing equities", unit="hand"):
-        equity = compute_multiway_equity(
-            hand_class,
-            num_opponents=num_opponents,
-            num_sims=num_sims,
-            seed=seed
-        )
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        equities = list(tqdm(
+            executor.map(compute_multiway_equity, hand_classes, repeat(num_opponents), repeat(num_sims), seeds),
+            total=len(hand_classes), desc="Computing equities", unit="hand"
+        ))
+
+    for hand_class, equity in zip(hand_classes, equities):
         combos = get_combo_count(hand_class)
 
         results.append({
@@ -96,14 +105,19 @@ def calculate_percentiles(df: pd.DataFrame) -> pd.DataFrame:
         2. Calculate cumulative combo count
         3. Percentile = (midpoint of combo range) / 1326 * 100
     """
-    df_sorted = df.sort_values('equity', ascending=False).copy()
+    equity = df['equity'].to_numpy()
+    order = np.argsort(-equity, kind='stable')
+    combos = df['combos'].to_numpy()[order]
 
-    df_sorted['cumulative_combos'] = df_sorted['combos'].cumsum()
+    cumulative_combos = combos.cumsum()
+    percentile = (cumulative_combos - combos / 2) / 1326 * 100
 
-    df_sorted['percentile'] = (
-            (df_sorted['cumulative_combos'] - df_sorted['combos'] / 2) / 1326 * 100
-    )
-    return df_sorted[['hand_class', 'equity', 'combos', 'percentile']]
+    return pd.DataFrame({
+        'hand_class': df['hand_class'].to_numpy()[order],
+        'equity': equity[order],
+        'combos': combos,
+        'percentile': percentile,
+    }, index=df.index[order])
 
 
 def create_grid_matrix(df: pd.DataFrame, value_column: str) -> np.ndarray:
@@ -120,21 +134,9 @@ def create_grid_matrix(df: pd.DataFrame, value_column: str) -> np.ndarray:
         - Upper triangle = suited hands
         - Lower triangle = offsuit hands
     """
-    matrix = np.zeros((13, 13))
-    value_dict = dict(zip(df['hand_class'], df[value_column]))
-
-    for i, rank1 in enumerate(RANKS):
-        for j, rank2 in enumerate(RANKS):
-            if i == j:
-                hand_class = f"{rank1}{rank1}"
-            elif i < j:
-                hand_class = f"{rank1}{rank2}s"
-            else:
-                hand_class = f"{rank2}{rank1}o"
-
-            matrix[i, j] = value_dict.get(hand_class, 0)
-
-    return matrix
+    values = df.set_index('hand_class')[value_column]
+    matrix = values.reindex(ALL_HAND_CLASSES, fill_value=0).to_numpy(dtype=float)
+    return matrix.reshape(13, 13)
 
 def plot_heatmap(
         matrix: np.ndarray,
@@ -150,25 +152,20 @@ def plot_heatmap(
     label = 'Percentile (%)' if is_percentile else 'Equity (%)'
     plt.colorbar(im, ax=ax, label=label)
 
+    # Cell texts and colors for the whole grid up front; matplotlib has no
+    # batched text call, so only ax.text() stays in the loop
+    threshold = matrix.max() * 0.5
+    text_colors = np.where(matrix < threshold, 'white', 'black')
+    cell_texts = [
+        [f"{_HAND_CLASS_GRID[i, j]}\n{matrix[i, j]:.1f}%" for j in range(13)]
+        for i in range(13)
+    ]
+
     for i in range(13):
         for j in range(13):
-            rank1, rank2 = RANKS[i], RANKS[j]
-            if i == j:
-                label = f"{rank1}{rank1}"
-            elif i < j:
-                label = f"{rank1}{rank2}s"
-            else:
-                label = f"{rank2}{rank1}o"
-
-            value = matrix[i, j]
-            value_text = f"{value:.1f}%"
-
-            threshold = matrix.max() * 0.5
-            text_color = 'white' if value < threshold else 'black'
-
-            ax.text(j, i, f"{label}\n{value_text}",
+            ax.text(j, i, cell_texts[i][j],
                     ha='center', va='center',
-                    fontsize=7, color=text_color, weight='bold')
+                    fontsize=7, color=text_colors[i, j], weight='bold')
 
     ax.set_xticks([])
     ax.set_yticks([])
@@ -1,13 +1,43 @@
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
 import random
-from src.deck import Card
+import threading
+import numpy as np
+from src.deck import ALL_CARDS, Card
+from src.fastdeck import card_mask
 
 
-RANKS = ['A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2']
-SUITS = ['s', 'h', 'd', 'c']
+RANKS = ('A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2')
+SUITS = ('s', 'h', 'd', 'c')
+
+# Position of each rank; also the O(1) membership test for valid ranks
+_RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+
+# Rejection-sampling attempts in sample_hand_from_class() before filtering
+_SAMPLE_RETRIES = 4
+
+_thread_local = threading.local()
+
+
+def _thread_rng() -> random.Random:
+    """This thread's own random.Random, created on first use."""
+    rng = getattr(_thread_local, 'rng', None)
+    if rng is None:
+        rng = _thread_local.rng = random.Random()
+    return rng
 
 
 def parse_hand_class(hand_class: str) -> Tuple[str, str, bool]:
+    # Canonical spellings are answered from a table without normalizing
+    parsed = _CANONICAL_PARSED.get(hand_class)
+    if parsed is not None:
+        return parsed
+    return _parse_hand_class(hand_class)
+
+
+# A pure function of a small domain (169 classes plus spelling variants)
+@lru_cache(maxsize=512)
+def _parse_hand_class(hand_class: str) -> Tuple[str, str, bool]:
     hand_class = hand_class.strip().upper()
 
     if len(hand_class) < 2 or len(hand_class) > 3:
@@ -16,7 +46,7 @@ def parse_hand_class(hand_class: str) -> Tuple[str, str, bool]:
     rank1 = hand_class[0]
     rank2 = hand_class[1]
 
-    if rank1 not in RANKS or rank2 not in RANKS:
+    if rank1 not in _RANK_INDEX or rank2 not in _RANK_INDEX:
         raise ValueError(f"Invalid ranks in hand class: {hand_class}")
 
     # Pairs
@@ -38,74 +68,210 @@ def parse_hand_class(hand_class: str) -> Tuple[str, str, bool]:
         raise ValueError(f"Non-pair hands must specify 's' or 'o': {hand_class}")
 
 
-def sample_hand_from_class(hand_class: str, excluded_cards: List[Card] = None) -> List[Card]:
+# Suit-index pairs of each kind of hand class: 6 for pairs, 4 suited, 12 offsuit
+_PAIR_SUITS = tuple((s1, s2) for s1 in range(4) for s2 in range(s1 + 1, 4))
+_SUITED_SUITS = tuple((s, s) for s in range(4))
+_OFFSUIT_SUITS = tuple((s1, s2) for s1 in range(4) for s2 in range(4) if s1 != s2)
+
+
+def _build_combo_ids(hand_class: str) -> Tuple[Tuple[int, int], ...]:
+    """Every combo of a hand class as Card.idx pairs (rank_index * 4 + suit_index)."""
+    rank1, rank2, is_suited = parse_hand_class(hand_class)
+    base1 = _RANK_INDEX[rank1] * 4
+    base2 = _RANK_INDEX[rank2] * 4
+    suit_pairs = _PAIR_SUITS if is_suited is None else (_SUITED_SUITS if is_suited else _OFFSUIT_SUITS)
+    return tuple((base1 + s1, base2 + s2) for s1, s2 in suit_pairs)
+
+
+def _grid_label(i: int, j: int) -> str:
+    """Hand class shown in row i, column j of the 13x13 grid."""
+    rank1, rank2 = RANKS[i], RANKS[j]
+    if i < j:  # Suited (rank1 > rank2)
+        return f"{rank1}{rank2}s"
+    elif i > j:  # Offsuit (rank1 < rank2, flip order)
+        return f"{rank2}{rank1}o"
+    else:  # Pair
+        return f"{rank1}{rank1}"
+
+
+# All 169 hand classes in 13x13 grid order (row by row)
+ALL_HAND_CLASSES = tuple(_grid_label(i, j) for i in range(13) for j in range(13))
+
+# parse_hand_class() results for the 169 canonical spellings
+_CANONICAL_PARSED: Dict[str, Tuple[str, str, bool]] = {
+    hand_class: _parse_hand_class(hand_class) for hand_class in ALL_HAND_CLASSES
+}
+
+# Combos of every canonical hand class, built once at import so lookups skip
+# parsing; other spellings ("aks", "KAs") fall back to _build_combo_ids()
+HAND_CLASS_COMBOS: Dict[str, Tuple[Tuple[int, int], ...]] = {
+    hand_class: _build_combo_ids(hand_class) for hand_class in ALL_HAND_CLASSES
+}
+
+# The same combos as fixed-size integer arrays for batch sampling:
+# COMBO_TABLE[HAND_CLASS_INDEX[hc], :COMBO_COUNTS[...]] holds the pairs
+HAND_CLASS_INDEX: Dict[str, int] = {hand_class: i for i, hand_class in enumerate(ALL_HAND_CLASSES)}
+
+
+def _combo_arrays() -> Tuple[np.ndarray, np.ndarray]:
+    table = np.zeros((len(HAND_CLASS_COMBOS), 12, 2), dtype=np.int8)
+    counts = np.zeros(len(HAND_CLASS_COMBOS), dtype=np.int8)
+    for i, combos in enumerate(HAND_CLASS_COMBOS.values()):
+        table[i, :len(combos)] = combos
+        counts[i] = len(combos)
+    return table, counts
+
+
+COMBO_TABLE, COMBO_COUNTS = _combo_arrays()
+
+
+def _combo_ids(hand_class: str) -> Tuple[Tuple[int, int], ...]:
+    combos = HAND_CLASS_COMBOS.get(hand_class)
+    if combos is None:
+        combos = _build_combo_ids(hand_class)
+    return combos
+
+
+def hand_class_combo_ids(hand_class: str, excluded_mask: int = 0) -> List[Tuple[int, int]]:
+    """
+    List every combo of a hand class as Card.idx pairs, skipping excluded cards.
+
+    Card ids are rank_index * 4 + suit_index, so combos are checked against
+    a bitmask without building Cards.
+
+    Args:
+        hand_class: Hand class like "AKs", "72o", "AA"
+        excluded_mask: Bitmask of cards already dealt (bit i = Card.idx i)
+
+    Returns:
+        List of (idx1, idx2) pairs, in a fixed order
+
+    Raises:
+        ValueError: If hand_class is not a valid hand class
+    """
+    combos = _combo_ids(hand_class)
+    if not excluded_mask:
+        return list(combos)
+    return [(a, b) for a, b in combos if not ((excluded_mask >> a) | (excluded_mask >> b)) & 1]
+
+
+def _excluded_mask(excluded_cards: Union[List[Card], int, None]) -> int:
+    """Excluded cards as a bitmask; callers that already track a mask pass it through."""
+    if isinstance(excluded_cards, int):
+        return excluded_cards
+    return card_mask(excluded_cards or ())
+
+
+def sample_hand_from_class(hand_class: str, excluded_cards: Union[List[Card], int] = None, rng=None) -> Tuple[Card, Card]:
     """
     Sample a random hand from a hand class.
     
     Args:
         hand_class: Hand class like "AKs", "72o", "AA"
-        excluded_cards: Cards that are already dealt (cannot be sampled)
+        excluded_cards: Cards that are already dealt (cannot be sampled), as
+            Cards or as a bitmask of Card.idx bits
+        rng: random.Random to sample with (defaults to a per-thread instance)
         
     Returns:
-        List of 2 cards
+        Tuple of 2 cards
         
     Raises:
         ValueError: If no valid combos available
         
     Examples:
-        "AKs" → [A♠, K♠] or [A♥, K♥] or [A♦, K♦] or [A♣, K♣]
-        "AA" → [A♠, A♥] or [A♠, A♦] or ... (6 possible combos)
-        "72o" → [7♠, 2♥] or [7♥, 2♠] or ... (12 possible combos)
+        "AKs" → (A♠, K♠) or (A♥, K♥) or (A♦, K♦) or (A♣, K♣)
+        "AA" → (A♠, A♥) or (A♠, A♦) or ... (6 possible combos)
+        "72o" → (7♠, 2♥) or (7♥, 2♠) or ... (12 possible combos)
     """
-    rank1, rank2, is_suited = parse_hand_class(hand_class)
+    idx1, idx2 = _sample_combo(_combo_ids(hand_class), _excluded_mask(excluded_cards), rng, hand_class)
+
+    # Card objects only at the boundary
+    return ALL_CARDS[idx1], ALL_CARDS[idx2]
+
+
+def _sample_combo(
+        combos: Tuple[Tuple[int, int], ...],
+        excluded_mask: int,
+        rng,
+        hand_class: str
+) -> Tuple[int, int]:
+    """Uniform live combo from combos; hand_class is only used in the error message."""
+    # Scaling random() picks an index without randrange's argument checks
+    uniform = (rng or _thread_rng()).random
+    num_combos = len(combos)
+
+    if not excluded_mask:
+        return combos[int(num_combos * uniform())]
+
+    # Few combos are ever blocked, so a handful of uniform draws almost always
+    # lands on a live one before the filtered list is needed
+    for _ in range(_SAMPLE_RETRIES):
+        idx1, idx2 = combos[int(num_combos * uniform())]
+        if not ((excluded_mask >> idx1) | (excluded_mask >> idx2)) & 1:
+            return idx1, idx2
+
+    # Pick the k-th live combo in a second pass instead of building a list
+    num_live = 0
+    for idx1, idx2 in combos:
+        if not ((excluded_mask >> idx1) | (excluded_mask >> idx2)) & 1:
+            num_live += 1
+
+    if not num_live:
+        raise ValueError(f"No valid combinations available for {hand_class} with given exclusions")
+
+    k = int(num_live * uniform())
+    for idx1, idx2 in combos:
+        if not ((excluded_mask >> idx1) | (excluded_mask >> idx2)) & 1:
+            if not k:
+                return idx1, idx2
+            k -= 1
+
+
+def sample_hands_batch(
+        hand_class: str,
+        n: int,
+        excluded_mask: int = 0,
+        rng: np.random.Generator = None
+) -> np.ndarray:
+    """
+    Sample n hands of a hand class at once, uniformly over live combos.
+
+    Batched counterpart of sample_hand_from_class() for simulation loops.
+
+    The class is resolved to its COMBO_TABLE row once and excluded combos
+    are masked out of that row, so the per-combo cost is a single random
+    integer and a gather.
+
+    Args:
+        hand_class: Hand class like "AKs", "72o", "AA"
+        n: Number of hands to draw (with replacement)
+        excluded_mask: Bitmask of cards already dealt (bit i = Card.idx i)
+        rng: NumPy random Generator (a fresh unseeded one by default)
+
+    Returns:
+        (n, 2) int8 array of Card.idx pairs
+
+    Raises:
+        ValueError: If no valid combos are available
+    """
+    class_id = HAND_CLASS_INDEX.get(hand_class)
+    if class_id is None:
+        combos = np.array(hand_class_combo_ids(hand_class), dtype=np.int8).reshape(-1, 2)
+    else:
+        combos = COMBO_TABLE[class_id, :COMBO_COUNTS[class_id]]
 
-    if excluded_cards is None:
-        excluded_cards = []
-
-    excluded_set = set((c.rank, c.suit) for c in excluded_cards)
-
-    # Generate all possible combos for this hand class
-    possible_hands = []
-
-    if is_suited is None:  # Pair
-        # All combinations of 2 different suits
-        for i, suit1 in enumerate(SUITS):
-            for suit2 in SUITS[i + 1:]:
-                card1 = (rank1, suit1)
-                card2 = (rank1, suit2)
-                if card1 not in excluded_set and card2 not in excluded_set:
-                    possible_hands.append([Card(rank1, suit1), Card(rank1, suit2)])
-
-    elif is_suited:  # Suited
-        # Both cards same suit
-        for suit in SUITS:
-            card1 = (rank1, suit)
-            card2 = (rank2, suit)
-            if card1 not in excluded_set and card2 not in excluded_set:
-                possible_hands.append([Card(rank1, suit), Card(rank2, suit)])
-
-    else:  # Offsuit
-        # Different suits
-        for suit1 in SUITS:
-            for suit2 in SUITS:
-                if suit1 != suit2:
-                    card1 = (rank1, suit1)
-                    card2 = (rank2, suit2)
-                    if card1 not in excluded_set and card2 not in excluded_set:
-                        possible_hands.append([Card(rank1, suit1), Card(rank2, suit2)])
-
-    if not possible_hands:
+    if excluded_mask:
+        blocked = (excluded_mask >> combos.astype(np.int64)) & 1
+        combos = combos[~blocked.any(axis=1)]
+    if len(combos) == 0:
         raise ValueError(f"No valid combinations available for {hand_class} with given exclusions")
 
-    return random.choice(possible_hands)
+    if rng is None:
+        rng = np.random.default_rng()
+    return combos[rng.integers(len(combos), size=n)]
 
 
 def get_combo_count(hand_class: str) -> int:
-    _, _, is_suited = parse_hand_class(hand_class)
-
-    if is_suited is None:  # Pair
-        return 6
-    elif is_suited:  # Suited
-        return 4
-    else:  # Offsuit
-        return 12
+    # 6 for pairs, 4 for suited, 12 for offsuit; other spellings (and invalid
+    # classes, which raise) go through the parser in _combo_ids()
+    return len(_combo_ids(hand_class))
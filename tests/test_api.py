@@ -1,5 +1,7 @@
 import unittest
-from src.live_odds import LiveOddsCalculator, parse_card_string, parse_cards_string
+from unittest import mock
+from api.app import app, orjson, OrjsonProvider, _equities_cached, _unfolded_result
+from src.live_odds import LiveOddsCalculator, parse_card_string, parse_cards_string, _runout_strengths
 from src.deck import Card
 
 
@@ -321,6 +323,12 @@ class TestCardParsing(unittest.TestCase):
         card = parse_card_string("10h")
         self.assertEqual(card, Card('T', 'h'))
 
+    def test_parse_returns_shared_cards(self):
+        """Every spelling of a card parses to the same Card instance."""
+        self.assertIs(parse_card_string("as"), parse_card_string("AS"))
+        self.assertIs(parse_card_string("10h"), parse_card_string("Th"))
+        self.assertIs(parse_card_string("Kd"), Card.from_idx(Card('K', 'd').idx))
+
 
 class TestPlayerCountValidation(unittest.TestCase):
     """Test player count validation."""
@@ -405,5 +413,64 @@ class TestBoardSizeValidation(unittest.TestCase):
         self.assertEqual(len(calc.board), 5)
 
 
+class TestCalculateEndpointCache(unittest.TestCase):
+    """/calculate memoizes results per normalized table state."""
+
+    def setUp(self):
+        _equities_cached.cache_clear()
+        _unfolded_result.cache_clear()
+        self.client = app.test_client()
+
+    def post(self, hands, folded=(), board=('Jh', 'Th', '2s')):
+        return self.client.post('/calculate', json={
+            'num_players': 3,
+            'hands': hands,
+            'board': list(board),
+            'folded': list(folded),
+        })
+
+    def test_identical_and_reordered_hands_share_result(self):
+        # Flop runouts are enumerated in-process through _runout_strengths
+        with mock.patch('src.live_odds._runout_strengths', wraps=_runout_strengths) as evaluate:
+            first = self.post(['As Ks', 'Qh Qd', '7c 3d'])
+            self.assertEqual(evaluate.call_count, 1)
+            again = self.post(['As Ks', 'Qh Qd', '7c 3d'])
+            reordered = self.post(['Ks As', 'Qd Qh', '3d 7c'])
+        self.assertEqual(evaluate.call_count, 1)
+        self.assertEqual(first.get_json(), again.get_json())
+        self.assertEqual(first.get_json(), reordered.get_json())
+
+    def test_fold_toggle_reuses_simulation(self):
+        # Only preflop samples are kept for re-scoring
+        with mock.patch('src.live_odds._runout_strengths', wraps=_runout_strengths) as evaluate:
+            self.post(['As Ks', 'Qh Qd', '7c 3d'], board=())
+            self.assertEqual(evaluate.call_count, 1)
+            folded = self.post(['As Ks', 'Qh Qd', '7c 3d'], folded=[2], board=()).get_json()
+        self.assertEqual(evaluate.call_count, 1)
+        self.assertEqual(folded['equities']['2'], 0.0)
+        self.assertAlmostEqual(folded['equities']['0'] + folded['equities']['1'], 1.0, places=6)
+
+    @unittest.skipIf(orjson is None, "orjson not installed")
+    def test_responses_use_orjson(self):
+        self.assertIsInstance(app.json, OrjsonProvider)
+        data = self.post(['As Ks', 'Qh Qd', '7c 3d']).get_json()
+        self.assertEqual(sorted(data['equities']), ['0', '1', '2'])
+
+    def test_flop_spots_keep_only_the_response(self):
+        self.post(['As Ks', 'Qh Qd', '7c 3d'])
+        hands = tuple(tuple(sorted(c.idx for c in parse_cards_string(h))) for h in ['As Ks', 'Qh Qd', '7c 3d'])
+        board = tuple(sorted(c.idx for c in parse_cards_string('Jh Th 2s')))
+        response, base = _unfolded_result(3, hands, board)
+        self.assertEqual(_unfolded_result.cache_info().hits, 1)
+        self.assertIsNone(base)
+        folded = self.post(['As Ks', 'Qh Qd', '7c 3d'], folded=[2]).get_json()
+        self.assertEqual(folded['equities']['2'], 0.0)
+
+    def test_errors_are_not_cached(self):
+        response = self.post(['As Ks', 'As Qd', '7c 3d'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['player'], 2)
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from src.deck import Card, Deck
+from src.deck import ALL_CARDS, Card, Deck
 
 
 class TestCard(unittest.TestCase):
@@ -22,6 +22,37 @@ class TestCard(unittest.TestCase):
         card1 = Card('A', 's')
         card2 = Card('A', 's')
         self.assertEqual(card1, card2)
+        self.assertNotEqual(card1, Card('A', 'h'))
+        self.assertNotEqual(card1, ('A', 's'))
+
+    def test_card_hash_is_index(self):
+        self.assertEqual(hash(Card('K', 'd')), Card('K', 'd').idx)
+        self.assertEqual(len({Card('A', 's'), Card('A', 's'), Card('A', 'h')}), 2)
+
+    def test_card_index(self):
+        self.assertEqual(Card('A', 's').idx, 0)
+        self.assertEqual(Card('A', 'c').idx, 3)
+        self.assertEqual(Card('K', 's').idx, 4)
+        self.assertEqual(Card('2', 'c').idx, 51)
+
+    def test_card_from_idx_round_trip(self):
+        for i in range(52):
+            self.assertEqual(Card.from_idx(i).idx, i)
+        self.assertEqual(Card.from_idx(0), Card('A', 's'))
+
+    def test_all_cards_shared_instances(self):
+        self.assertEqual(len(set(ALL_CARDS)), 52)
+        for i in range(52):
+            self.assertIs(Card.from_idx(i), ALL_CARDS[i])
+        deck = Deck()
+        card = deck.deal_one()
+        self.assertIs(card, ALL_CARDS[card.idx])
+
+    def test_invalid_card_raises(self):
+        with self.assertRaisesRegex(ValueError, r"Invalid card"):
+            Card('X', 's')
+        with self.assertRaisesRegex(ValueError, r"Invalid card"):
+            Card('A', 'x')
 
 
 class TestDeck(unittest.TestCase):
@@ -117,6 +148,21 @@ class TestDeck(unittest.TestCase):
         self.assertEqual(len(deck), 52)
         self.assertFalse(deck.is_empty())
 
+    def test_remove_idx(self):
+        deck = Deck()
+        ace = Card('A', 's')
+        deck.remove_idx(ace.idx)
+        self.assertEqual(len(deck), 51)
+        self.assertFalse(deck.mask & (1 << ace.idx))
+
+        # Removing the same card twice is a no-op
+        deck.remove_idx(ace.idx)
+        self.assertEqual(len(deck), 51)
+
+        cards = [deck.deal_one() for _ in range(51)]
+        self.assertNotIn(ace, cards)
+        self.assertTrue(deck.is_empty())
+
     def test_deck_string_representation(self):
         deck = Deck()
         self.assertIn("52", str(deck))
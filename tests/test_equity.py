@@ -1,42 +1,32 @@
+from functools import lru_cache
+import random
 import unittest
-from src.equity import compute_heads_up_equity, compute_equity_vs_hand, compute_multiway_equity
-from src.utils import parse_hand_class, sample_hand_from_class, get_combo_count
+import numpy as np
+from unittest import mock
+from src.equity import (
+    compute_heads_up_equity, compute_equity_curve, compute_equity_vs_hand, compute_multiway_equity,
+)
+from src.fastdeck import card_mask, sample_boards
+from src.utils import (
+    parse_hand_class, sample_hand_from_class, get_combo_count, hand_class_combo_ids,
+    sample_hands_batch, ALL_HAND_CLASSES, HAND_CLASS_COMBOS,
+)
 from src.deck import Card
 
 
 class TestHandClassParsing(unittest.TestCase):
-    def test_parse_pair(self):
-        r1, r2, suited = parse_hand_class("AA")
-        self.assertEqual(r1, 'A')
-        self.assertEqual(r2, 'A')
-        self.assertIsNone(suited)
-
-        r1, r2, suited = parse_hand_class("22")
-        self.assertEqual(r1, '2')
-        self.assertEqual(r2, '2')
-        self.assertIsNone(suited)
-
-    def test_parse_suited(self):
-        r1, r2, suited = parse_hand_class("AKs")
-        self.assertEqual(r1, 'A')
-        self.assertEqual(r2, 'K')
-        self.assertTrue(suited)
-
-        r1, r2, suited = parse_hand_class("72s")
-        self.assertEqual(r1, '7')
-        self.assertEqual(r2, '2')
-        self.assertTrue(suited)
-
-    def test_parse_offsuit(self):
-        r1, r2, suited = parse_hand_class("AKo")
-        self.assertEqual(r1, 'A')
-        self.assertEqual(r2, 'K')
-        self.assertFalse(suited)
-
-        r1, r2, suited = parse_hand_class("72o")
-        self.assertEqual(r1, '7')
-        self.assertEqual(r2, '2')
-        self.assertFalse(suited)
+    def test_parse_valid(self):
+        cases = [
+            ("AA", 'A', 'A', None),
+            ("22", '2', '2', None),
+            ("AKs", 'A', 'K', True),
+            ("72s", '7', '2', True),
+            ("AKo", 'A', 'K', False),
+            ("72o", '7', '2', False),
+        ]
+        for hand_class, rank1, rank2, suited in cases:
+            with self.subTest(hand_class=hand_class):
+                self.assertEqual(parse_hand_class(hand_class), (rank1, rank2, suited))
 
     def test_parse_invalid(self):
         with self.assertRaises(ValueError):
@@ -55,26 +45,15 @@ class TestHandClassParsing(unittest.TestCase):
 
 
 class TestHandSampling(unittest.TestCase):
-    def test_sample_pair(self):
-        hand = sample_hand_from_class("AA")
-        self.assertEqual(len(hand), 2)
-        self.assertEqual(hand[0].rank, 'A')
-        self.assertEqual(hand[1].rank, 'A')
-        self.assertNotEqual(hand[0].suit, hand[1].suit)  # different suits
-
-    def test_sample_suited(self):
-        hand = sample_hand_from_class("AKs")
-        self.assertEqual(len(hand), 2)
-        self.assertEqual(hand[0].rank, 'A')
-        self.assertEqual(hand[1].rank, 'K')
-        self.assertEqual(hand[0].suit, hand[1].suit)  # same suit
-
-    def test_sample_offsuit(self):
-        hand = sample_hand_from_class("AKo")
-        self.assertEqual(len(hand), 2)
-        self.assertEqual(hand[0].rank, 'A')
-        self.assertEqual(hand[1].rank, 'K')
-        self.assertNotEqual(hand[0].suit, hand[1].suit)  # different suits
+    def test_sample_shapes(self):
+        # (hand class, first rank, second rank, same suit)
+        cases = [("AA", 'A', 'A', False), ("AKs", 'A', 'K', True), ("AKo", 'A', 'K', False)]
+        for hand_class, rank1, rank2, same_suit in cases:
+            with self.subTest(hand_class=hand_class):
+                hand = sample_hand_from_class(hand_class)
+                self.assertEqual(len(hand), 2)
+                self.assertEqual((hand[0].rank, hand[1].rank), (rank1, rank2))
+                self.assertEqual(hand[0].suit == hand[1].suit, same_suit)
 
     def test_sample_with_exclusions(self):
         excluded = [Card('A', 's'), Card('A', 'h')]
@@ -87,6 +66,64 @@ class TestHandSampling(unittest.TestCase):
         self.assertIn(hand[0].suit, ['d', 'c'])
         self.assertIn(hand[1].suit, ['d', 'c'])
 
+    def test_sample_with_exclusions_covers_live_combos(self):
+        rng = random.Random(3)
+        excluded = [Card('A', 's'), Card('K', 'h')]
+        seen = {tuple(c.idx for c in sample_hand_from_class("AKo", excluded, rng)) for _ in range(500)}
+        expected = set(hand_class_combo_ids("AKo", card_mask(excluded)))
+        self.assertEqual(seen, expected)
+
+    def test_sample_hands_batch(self):
+        rng = np.random.default_rng(4)
+        excluded = [Card('A', 's'), Card('K', 'h')]
+        mask = (1 << excluded[0].idx) | (1 << excluded[1].idx)
+        combos = sample_hands_batch("AKo", 2000, mask, rng)
+        self.assertEqual(combos.shape, (2000, 2))
+        expected = set(hand_class_combo_ids("AKo", mask))
+        self.assertEqual({tuple(c) for c in combos.tolist()}, expected)
+
+        with self.assertRaises(ValueError):
+            sample_hands_batch("AA", 1, mask | (1 << Card('A', 'h').idx) | (1 << Card('A', 'd').idx), rng)
+
+    def test_exclusions_as_bitmask(self):
+        excluded = [Card('A', 's'), Card('A', 'h')]
+        mask = (1 << excluded[0].idx) | (1 << excluded[1].idx)
+        hand = sample_hand_from_class("AA", excluded_cards=mask)
+        self.assertEqual({c.suit for c in hand}, {'d', 'c'})
+
+    def test_default_rng_leaves_global_random_untouched(self):
+        random.seed(5)
+        expected = random.random()
+        random.seed(5)
+        for _ in range(10):
+            sample_hand_from_class("AKo", excluded_cards=[Card('A', 's')])
+        self.assertEqual(random.random(), expected)
+
+    def test_hand_class_combo_ids(self):
+        for hand_class in ("AA", "AKs", "72o"):
+            combos = hand_class_combo_ids(hand_class)
+            self.assertEqual(len(combos), get_combo_count(hand_class))
+            self.assertEqual(len({frozenset(combo) for combo in combos}), len(combos))
+
+        combos = hand_class_combo_ids("AKs", card_mask([Card('K', 's')]))
+        self.assertEqual(combos, [(c.idx, d.idx) for c, d in
+                                  ((Card('A', 'h'), Card('K', 'h')), (Card('A', 'd'), Card('K', 'd')),
+                                   (Card('A', 'c'), Card('K', 'c')))])
+
+    def test_hand_class_combo_ids_skip_excluded(self):
+        mask = card_mask([Card('K', 's'), Card('7', 'h')])
+        for hand_class in ("AA", "AKo", "K7s", "72o"):
+            ids = hand_class_combo_ids(hand_class, mask)
+            self.assertEqual(ids, [(a, b) for a, b in hand_class_combo_ids(hand_class) if not (mask >> a | mask >> b) & 1])
+
+    def test_hand_class_combo_table(self):
+        self.assertEqual(tuple(HAND_CLASS_COMBOS), ALL_HAND_CLASSES)
+        self.assertEqual(len(set(ALL_HAND_CLASSES)), 169)
+        self.assertEqual(sum(len(combos) for combos in HAND_CLASS_COMBOS.values()), 1326)
+        # Non-canonical spellings are parsed instead of looked up
+        self.assertEqual(hand_class_combo_ids("kas"), hand_class_combo_ids("KAs"))
+        self.assertEqual(get_combo_count("aks"), 4)
+
 
 class TestHeadsUpEquity(unittest.TestCase):
     """Tests for heads-up (2-player) equity calculation."""
@@ -112,6 +149,13 @@ class TestHeadsUpEquity(unittest.TestCase):
         equity2 = compute_heads_up_equity("KK", num_sims=10_000, seed=123)
         self.assertEqual(equity1, equity2)
 
+    def test_seed_leaves_global_random_untouched(self):
+        random.seed(5)
+        expected = random.random()
+        random.seed(5)
+        compute_heads_up_equity("KK", num_sims=100, seed=123)
+        self.assertEqual(random.random(), expected)
+
     def test_equity_converges(self):
         equity_small = compute_heads_up_equity("QQ", num_sims=1_000, seed=99)
         equity_large = compute_heads_up_equity("QQ", num_sims=50_000, seed=99)
@@ -120,22 +164,29 @@ class TestHeadsUpEquity(unittest.TestCase):
         self.assertTrue(0.78 <= equity_large <= 0.82)
 
 
+# Seeded runs are deterministic, so tests asking for the same spot share one
+# simulation
+@lru_cache(maxsize=None)
+def _multiway(hand_class: str, num_opponents: int, num_sims: int, seed: int) -> float:
+    return compute_multiway_equity(hand_class, num_opponents=num_opponents, num_sims=num_sims, seed=seed)
+
+
 class TestMultiwayEquity(unittest.TestCase):
     def test_aces_lower_equity_multiway(self):
-        equity = compute_multiway_equity("AA", num_opponents=5, num_sims=30_000, seed=42)
+        equity = _multiway("AA", 5, 30_000, 42)
         # Based on actual simulation results
         self.assertTrue(0.47 <= equity <= 0.52)  # ~49% ± 2%
 
     def test_worst_hand_very_low_equity_multiway(self):
-        equity = compute_multiway_equity("72o", num_opponents=5, num_sims=30_000, seed=42)
+        equity = _multiway("72o", 5, 30_000, 42)
         self.assertTrue(0.07 <= equity <= 0.10)
 
     def test_kings_multiway(self):
-        equity = compute_multiway_equity("KK", num_opponents=5, num_sims=30_000, seed=42)
+        equity = _multiway("KK", 5, 30_000, 42)
         self.assertTrue(0.41 <= equity <= 0.46)  # ~43% ± 2%
 
     def test_ak_suited_multiway(self):
-        equity = compute_multiway_equity("AKs", num_opponents=5, num_sims=30_000, seed=42)
+        equity = _multiway("AKs", 5, 30_000, 42)
         self.assertTrue(0.29 <= equity <= 0.34)  # ~31% ± 2%
 
     def test_multiway_reproducible(self):
@@ -144,28 +195,37 @@ class TestMultiwayEquity(unittest.TestCase):
         self.assertEqual(equity1, equity2)
 
     def test_multiway_fewer_opponents(self):
-        equity_headsup = compute_heads_up_equity("AA", num_sims=20_000, seed=42)
-        equity_3player = compute_multiway_equity("AA", num_opponents=2, num_sims=20_000, seed=42)
-        equity_6player = compute_multiway_equity("AA", num_opponents=5, num_sims=20_000, seed=42)
+        equity_headsup, equity_3player, _, _, equity_6player = compute_equity_curve("AA", 5, num_sims=20_000, seed=42)
 
         # More opponents = lower equity
         self.assertGreater(equity_headsup, equity_3player)
         self.assertGreater(equity_3player, equity_6player)
 
+    def test_equity_curve_matches_multiway(self):
+        curve = compute_equity_curve("KK", 3, num_sims=5_000, seed=3)
+        self.assertEqual(curve.shape, (3,))
+        self.assertAlmostEqual(curve[-1], compute_multiway_equity("KK", num_opponents=3, num_sims=5_000, seed=3))
+
+    def test_requires_an_opponent(self):
+        with self.assertRaisesRegex(ValueError, "at least 1 opponent"):
+            compute_multiway_equity("AA", num_opponents=0, num_sims=100, seed=1)
+        with self.assertRaisesRegex(ValueError, "at least 1 opponent"):
+            compute_equity_curve("AA", 0, num_sims=100, seed=1)
+
     def test_trash_hand_ordering_multiway(self):
         # In 6-player, the worst hands should have very distinct equities
-        equity_72o = compute_multiway_equity("72o", num_opponents=5, num_sims=20_000, seed=42)
-        equity_32o = compute_multiway_equity("32o", num_opponents=5, num_sims=20_000, seed=42)
-        equity_43o = compute_multiway_equity("43o", num_opponents=5, num_sims=20_000, seed=42)
+        equity_72o = _multiway("72o", 5, 20_000, 42)
+        equity_32o = _multiway("32o", 5, 20_000, 42)
+        equity_43o = _multiway("43o", 5, 20_000, 42)
 
         # 72o should be worst, then 32o, then 43o
         self.assertLess(equity_72o, equity_32o)
         self.assertLess(equity_32o, equity_43o)
 
     def test_premium_hand_ordering_multiway(self):
-        equity_aa = compute_multiway_equity("AA", num_opponents=5, num_sims=20_000, seed=42)
-        equity_kk = compute_multiway_equity("KK", num_opponents=5, num_sims=20_000, seed=42)
-        equity_qq = compute_multiway_equity("QQ", num_opponents=5, num_sims=20_000, seed=42)
+        equity_aa = _multiway("AA", 5, 20_000, 42)
+        equity_kk = _multiway("KK", 5, 20_000, 42)
+        equity_qq = _multiway("QQ", 5, 20_000, 42)
 
         # AA > KK > QQ
         self.assertGreater(equity_aa, equity_kk)
@@ -200,6 +260,26 @@ class TestSpecificHandEquity(unittest.TestCase):
         equity = compute_equity_vs_hand(hero, villain, known_board=board, num_sims=1)
         self.assertEqual(equity, 0.0)  # Villain's set beats two pair
 
+    def test_isomorphic_spots_same_equity(self):
+        equity1 = compute_equity_vs_hand(
+            [Card('A', 's'), Card('K', 's')], [Card('Q', 'h'), Card('Q', 'd')],
+            known_board=[Card('7', 's'), Card('2', 'h'), Card('9', 'c')], num_sims=2_000, seed=5
+        )
+        equity2 = compute_equity_vs_hand(
+            [Card('A', 'c'), Card('K', 'c')], [Card('Q', 'd'), Card('Q', 's')],
+            known_board=[Card('7', 'c'), Card('2', 'd'), Card('9', 'h')], num_sims=2_000, seed=5
+        )
+        self.assertEqual(equity1, equity2)
+
+    def test_tolerance_stops_early_on_lopsided_spot(self):
+        hero = [Card('A', 's'), Card('A', 'h')]
+        villain = [Card('7', 'd'), Card('2', 'c')]
+        flop = [Card('A', 'd'), Card('K', 'c'), Card('9', 's')]
+        with mock.patch('src.equity.sample_boards', wraps=sample_boards) as sampler:
+            equity = compute_equity_vs_hand(hero, villain, known_board=flop, num_sims=50_000, seed=3, tol=0.005)
+        self.assertEqual(sampler.call_count, 1)  # decided in the first batch
+        self.assertGreater(equity, 0.97)
+
 
 if __name__ == '__main__':
     unittest.main()
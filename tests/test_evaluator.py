@@ -1,6 +1,20 @@
 import unittest
-from src.deck import Card, Deck
-from src.evaluator import evaluate, handtype, compare
+import numpy as np
+from src.deck import ALL_CARDS, Card, Deck
+from src.evaluator import (
+    EVAL7_CARDS, evaluate, evaluate_eval7, evaluate_idx, evaluate_many, handtype, compare,
+    finalize_many, partial_state,
+    _evaluate_many_numpy, _evaluate_one_scalar, _finalize_many_numpy, _STRAIGHT_TOP, _TOP5,
+)
+
+
+# Card indices 0..51; dealing permutes these instead of building Deck objects
+DECK = np.arange(52, dtype=np.uint8)
+
+
+def _deal(seed: int, n: int) -> np.ndarray:
+    """Deal n distinct card indices from a deck shuffled with seed."""
+    return np.random.default_rng(seed).permutation(DECK)[:n]
 
 
 class TestEvaluator(unittest.TestCase):
@@ -59,14 +73,12 @@ class TestEvaluator(unittest.TestCase):
         self.assertEqual(compare(royal_flush, royal_flush), 0)  # tie
 
     def test_dealt_hands(self):
-        deck = Deck()
-        deck.shuffle(seed=42)
+        dealt = _deal(42, 14).tolist()
+        hand1 = [ALL_CARDS[i] for i in dealt[:7]]
+        hand2 = [ALL_CARDS[i] for i in dealt[7:]]
 
-        hand1 = [deck.deal_one() for _ in range(7)]
-        hand2 = [deck.deal_one() for _ in range(7)]
-
-        rank1 = evaluate(hand1)
-        rank2 = evaluate(hand2)
+        rank1 = evaluate_idx(dealt[:7])
+        rank2 = evaluate_idx(dealt[7:])
 
         self.assertGreater(rank1, 0)
         self.assertGreater(rank2, 0)
@@ -74,6 +86,76 @@ class TestEvaluator(unittest.TestCase):
         result = compare(hand1, hand2)
         self.assertIn(result, (-1, 0, 1))
 
+    def test_evaluate_idx_matches_evaluate(self):
+        deck = Deck()
+        deck.shuffle(seed=7)
+
+        for _ in range(7):
+            hand = [deck.deal_one() for _ in range(7)]
+            self.assertEqual(evaluate_idx([c.idx for c in hand]), evaluate(hand))
+            deck.reset()
+            deck.shuffle()
+
+    def test_evaluate_eval7_buffer_reuse(self):
+        board = [8, 17, 26, 35, 44]
+        hand = [EVAL7_CARDS[i] for i in [0, 1] + board]
+        self.assertEqual(evaluate_eval7(hand), evaluate_idx([0, 1] + board))
+        hand[0], hand[1] = EVAL7_CARDS[50], EVAL7_CARDS[51]
+        self.assertEqual(evaluate_eval7(hand), evaluate_idx([50, 51] + board))
+
+    def test_evaluate_many_matches_evaluate_idx(self):
+        rng = np.random.default_rng(11)
+        # Full deck, then a two-suit / few-rank deck to hit flushes and full houses
+        for deck in (np.arange(52), np.array([i for i in range(52) if i % 4 < 2 or i < 12])):
+            hands = deck[np.argsort(rng.random((5000, len(deck))), axis=1)[:, :7]]
+            expected = [evaluate_idx(hand) for hand in hands.tolist()]
+            self.assertEqual(evaluate_many(hands).tolist(), expected)
+            self.assertEqual(_evaluate_many_numpy(hands).tolist(), expected)
+
+    def test_scalar_evaluator_matches_evaluate_idx(self):
+        rng = np.random.default_rng(12)
+        hands = np.argsort(rng.random((2000, 52)), axis=1)[:, :7].tolist()
+        for hand in hands:
+            self.assertEqual(_evaluate_one_scalar(hand, _TOP5, _STRAIGHT_TOP), evaluate_idx(hand))
+
+    def test_evaluate_many_categories(self):
+        hands = [
+            ['As', 'Ks', 'Qs', 'Js', 'Ts', '2h', '3h'],  # straight flush
+            ['5d', '4d', '3d', '2d', 'Ad', 'Kc', 'Kh'],  # wheel straight flush
+            ['9c', '9d', '9h', '9s', '2c', '2d', '2h'],  # quads over trips
+            ['Kc', 'Kd', 'Kh', '7s', '7c', '7d', '2h'],  # two trips
+            ['Ac', 'Ad', 'Kc', 'Kd', 'Qc', 'Qd', '2h'],  # three pairs
+            ['5c', '4d', '3h', '2s', 'Ah', 'Kc', 'Kd'],  # wheel
+        ]
+        cards = [[Card(c[0], c[1]) for c in hand] for hand in hands]
+        batch = evaluate_many(np.array([[c.idx for c in hand] for hand in cards]))
+        self.assertEqual(batch.tolist(), [evaluate(hand) for hand in cards])
+
+    def test_evaluate_many_shape(self):
+        with self.assertRaises(ValueError):
+            evaluate_many(np.zeros((3, 6), dtype=np.int64))
+        self.assertEqual(evaluate_many(np.zeros((0, 7), dtype=np.int64)).shape, (0,))
+
+    def test_finalize_many_matches_evaluate_idx(self):
+        rng = np.random.default_rng(13)
+        deck = np.array([i for i in range(52) if i % 4 < 2 or i < 12])
+        hands = deck[np.argsort(rng.random((500, len(deck))), axis=1)[:, :7]]
+        # Shared cards as on each street: hole cards, flop, turn, full board
+        for shared in (2, 5, 6, 7):
+            state = partial_state(hands[0, :shared])
+            rest = deck[~np.isin(deck, hands[0, :shared])]
+            rows = rest[np.argsort(rng.random((500, len(rest))), axis=1)[:, :7 - shared]]
+            expected = [evaluate_idx(hands[0, :shared].tolist() + row) for row in rows.tolist()]
+            self.assertEqual(finalize_many(state, rows).tolist(), expected)
+            self.assertEqual(_finalize_many_numpy(state, rows.astype(np.int64)).tolist(), expected)
+
+    def test_finalize_many_shape(self):
+        state = partial_state([0, 4, 8])
+        with self.assertRaisesRegex(ValueError, r"\(N, 4\)"):
+            finalize_many(state, np.zeros((3, 2), dtype=np.int64))
+        with self.assertRaises(ValueError):
+            partial_state(list(range(8)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from src.deck import ALL_CARDS, Card
+from src.fastdeck import Z, card_mask, live_indices, sample_boards, within_tolerance
+
+
+class TestCardMask(unittest.TestCase):
+    def test_card_mask(self):
+        mask = card_mask([Card('A', 's'), Card('2', 'c')])
+        self.assertEqual(mask, (1 << 0) | (1 << 51))
+
+
+class TestDraw(unittest.TestCase):
+    def test_live_indices_excludes_mask(self):
+        excluded = card_mask([Card('A', 's'), Card('K', 'h')])
+        live = live_indices(excluded)
+        self.assertEqual(len(live), 50)
+        self.assertNotIn(Card('A', 's').idx, live)
+        self.assertNotIn(Card('K', 'h').idx, live)
+
+    def test_sample_boards_rows_distinct_and_excluded(self):
+        excluded = card_mask([Card('A', 's'), Card('K', 's'), Card('Q', 'h'), Card('Q', 'd')])
+        boards = sample_boards(excluded, 1000, 5, np.random.default_rng(42))
+        self.assertEqual(boards.shape, (1000, 5))
+        for row in boards.tolist():
+            self.assertEqual(len(set(row)), 5)
+            self.assertFalse(card_mask(ALL_CARDS[i] for i in row) & excluded)
+
+    def test_sample_boards_uniform(self):
+        excluded = card_mask([Card('A', 's'), Card('7', 'd')])
+        boards = sample_boards(excluded, 50_000, 2, np.random.default_rng(4))
+        counts = np.bincount(boards.ravel(), minlength=52)
+        live = counts[counts > 0]
+        self.assertEqual(len(live), 50)
+        expected = 50_000 * 2 / 50
+        self.assertTrue(np.all(np.abs(live - expected) < 0.1 * expected))
+
+    def test_sample_boards_reproducible(self):
+        b1 = sample_boards(0, 100, 3, np.random.default_rng(9))
+        b2 = sample_boards(0, 100, 3, np.random.default_rng(9))
+        self.assertTrue(np.array_equal(b1, b2))
+
+
+class TestWithinTolerance(unittest.TestCase):
+    def test_matches_standard_error(self):
+        payouts = np.array([1.0, 0.0, 0.5, 1.0] * 250)
+        half_width = Z * payouts.std() / np.sqrt(len(payouts))
+        total, total_sq = payouts.sum(), (payouts * payouts).sum()
+        self.assertTrue(within_tolerance(total, total_sq, len(payouts), half_width * 1.01))
+        self.assertFalse(within_tolerance(total, total_sq, len(payouts), half_width * 0.99))
+
+    def test_every_entry_must_converge(self):
+        # Player 0 always wins (zero variance), player 1 is a coin flip
+        self.assertFalse(within_tolerance(np.array([100.0, 50.0]), np.array([100.0, 50.0]), 100, 0.05))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from src.deck import Card
+from src.iso import canonicalize
+
+
+class TestCanonicalize(unittest.TestCase):
+    def test_isomorphic_spots_match(self):
+        spot1 = canonicalize(
+            [Card('A', 's'), Card('K', 's')],
+            [Card('A', 'h'), Card('K', 'h')],
+            [Card('K', 'c'), Card('7', 'h'), Card('2', 's')]
+        )
+        spot2 = canonicalize(
+            [Card('A', 'h'), Card('K', 'h')],
+            [Card('A', 'd'), Card('K', 'd')],
+            [Card('K', 's'), Card('7', 'd'), Card('2', 'h')]
+        )
+        self.assertEqual(spot1[:3], spot2[:3])
+
+    def test_card_order_within_hand_ignored(self):
+        a = canonicalize([Card('A', 's'), Card('K', 'd')], [Card('Q', 'h'), Card('Q', 'c')], [])
+        b = canonicalize([Card('K', 'd'), Card('A', 's')], [Card('Q', 'c'), Card('Q', 'h')], [])
+        self.assertEqual(a[:3], b[:3])
+
+    def test_different_spots_differ(self):
+        suited = canonicalize([Card('A', 's'), Card('K', 's')], [Card('Q', 'h'), Card('Q', 'd')], [])
+        offsuit = canonicalize([Card('A', 's'), Card('K', 'h')], [Card('Q', 'h'), Card('Q', 'd')], [])
+        self.assertNotEqual(suited[:3], offsuit[:3])
+
+    def test_canonical_cards_are_shared_instances(self):
+        hero, villain, board, _ = canonicalize(
+            [Card('A', 'd'), Card('K', 'd')], [Card('Q', 'h'), Card('Q', 'c')], [Card('2', 's')])
+        for card in hero + villain + board:
+            self.assertIs(card, Card.from_idx(card.idx))
+
+    def test_perm_is_full_permutation(self):
+        hero, villain, board, perm = canonicalize(
+            [Card('A', 'c'), Card('K', 'c')], [Card('Q', 'd'), Card('J', 'd')], []
+        )
+        self.assertEqual(sorted(perm), ['c', 'd', 'h', 's'])
+        self.assertEqual(sorted(perm.values()), ['c', 'd', 'h', 's'])
+        self.assertEqual(perm['c'], 's')
+        self.assertEqual(hero, (Card('A', 's'), Card('K', 's')))
+
+
+if __name__ == '__main__':
+    unittest.main()
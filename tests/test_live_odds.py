@@ -1,10 +1,16 @@
 import unittest
+import numpy as np
+from unittest import mock
 from src.live_odds import (
     LiveOddsCalculator,
     parse_card_string,
     parse_cards_string,
     validate_unique_cards,
     validate_rank_count,
+    SHARD_SIMS,
+    _runout_strengths,
+    _showdown_ranks,
+    _tally,
 )
 from src.deck import Card
 
@@ -34,6 +40,11 @@ class TestCardParsing(unittest.TestCase):
         cards = parse_cards_string("  As   Qd  ")
         self.assertEqual(cards, [Card('A', 's'), Card('Q', 'd')])
 
+    def test_parse_cards_returns_fresh_list(self):
+        first = parse_cards_string("As Kh")
+        first.append(Card('2', 'c'))
+        self.assertEqual(parse_cards_string("As  Kh"), [Card('A', 's'), Card('K', 'h')])
+
     def test_parse_invalid_rank_or_suit(self):
         with self.assertRaises(ValueError):
             parse_card_string("1s")
@@ -200,6 +211,35 @@ class TestLiveOddsCalculatorBasics(unittest.TestCase):
         with self.assertRaises(ValueError):
             calc.calculate_equities(num_sims=1000, seed=1)
 
+    def test_index_mirrors_track_cards(self):
+        calc = LiveOddsCalculator(2)
+        calc.add_player_hand([Card('A', 's'), Card('K', 's')])
+        calc.add_player_hand([Card('Q', 'h'), Card('Q', 'd')])
+        calc.deal_flop([Card('2', 'c'), Card('7', 'd'), Card('9', 's')])
+        calc.deal_turn(Card('J', 'c'))
+        calc.deal_river(Card('3', 'h'))
+
+        self.assertEqual(calc._hole_idx.tolist(), [[h.idx for h in hand] for hand in calc.player_hands])
+        self.assertEqual(calc._board_idx, [c.idx for c in calc.board])
+        expected_mask = 0
+        for card in calc.get_all_known_cards():
+            expected_mask |= 1 << card.idx
+        self.assertEqual(calc._dead_mask, expected_mask)
+
+    def test_set_board_replacement_frees_old_cards(self):
+        calc = LiveOddsCalculator(2)
+        calc.add_player_hand([Card('A', 's'), Card('K', 's')])
+        calc.add_player_hand([Card('Q', 'h'), Card('Q', 'd')])
+        calc.set_board([Card('2', 'c'), Card('7', 'd'), Card('9', 's')])
+        calc.set_board([Card('3', 'c'), Card('7', 'd'), Card('8', 's')])
+
+        # 2c left the board, so it can be dealt again; a conflict changes nothing
+        calc.deal_turn(Card('2', 'c'))
+        with self.assertRaisesRegex(ValueError, "Duplicate card: As"):
+            calc.deal_river(Card('A', 's'))
+        self.assertEqual(len(calc.board), 4)
+        self.assertFalse(calc._dead_mask & (1 << Card('9', 's').idx))
+
     def test_reproducible_with_seed(self):
         calc = LiveOddsCalculator(2)
         calc.add_player_hand([Card('A', 's'), Card('K', 's')])
@@ -272,6 +312,41 @@ class TestDeterministicBoards(unittest.TestCase):
         self.assertAlmostEqual(equities[1], 1 / 3, places=6)
         self.assertAlmostEqual(equities[2], 1 / 3, places=6)
 
+    def test_river_skips_simulation(self):
+        calc = LiveOddsCalculator(3)
+        calc.add_player_hand([Card('K', 's'), Card('K', 'h')])
+        calc.add_player_hand([Card('Q', 's'), Card('Q', 'h')])
+        calc.add_player_hand([Card('A', 'c'), Card('3', 'h')])
+        calc.set_board([Card('K', 'd'), Card('Q', 'd'), Card('2', 'c'), Card('7', 'h'), Card('9', 's')])
+        with mock.patch('src.live_odds._simulate_shard') as simulate:
+            equities = calc.calculate_equities(num_sims=10_000)
+        simulate.assert_not_called()
+        self.assertEqual(equities, calc.river_equities())
+        self.assertEqual(equities, {0: 1.0, 1: 0.0, 2: 0.0})
+
+    def test_turn_enumerates_every_river(self):
+        calc = LiveOddsCalculator(2)
+        calc.add_player_hand([Card('A', 's'), Card('A', 'h')])
+        calc.add_player_hand([Card('K', 'd'), Card('K', 'c')])
+        calc.set_board([Card('2', 'c'), Card('7', 'd'), Card('9', 's'), Card('J', 'h')])
+        with mock.patch('src.live_odds._simulate_shard') as simulate:
+            equities = calc.calculate_equities(num_sims=10_000)
+        simulate.assert_not_called()
+        self.assertEqual(calc.last_num_sims, 44)
+        # Kings win only on one of the two kings left
+        self.assertAlmostEqual(equities[1], 2 / 44, places=9)
+
+    def test_flop_enumeration_ignores_seed(self):
+        calc = LiveOddsCalculator(2)
+        calc.add_player_hand([Card('A', 's'), Card('K', 's')])
+        calc.add_player_hand([Card('Q', 'h'), Card('Q', 'd')])
+        calc.deal_flop([Card('2', 's'), Card('7', 's'), Card('J', 'c')])
+        e1 = calc.calculate_equities(num_sims=500, seed=1)
+        self.assertEqual(calc.last_num_sims, 990)
+        calc._sample_cache = None
+        e2 = calc.calculate_equities(num_sims=500, seed=2)
+        self.assertEqual(e1, e2)
+
 
 class TestMonteCarloSanity(unittest.TestCase):
     def test_preflop_aces_vs_kings(self):
@@ -320,6 +395,27 @@ class TestMonteCarloSanity(unittest.TestCase):
 
         self.assertCountEqual(list(e1.values()), list(e2.values()))
 
+    def test_tolerance_stops_early(self):
+        calc = LiveOddsCalculator(2)
+        calc.add_player_hand([Card('A', 's'), Card('A', 'h')])
+        calc.add_player_hand([Card('7', 'd'), Card('2', 'c')])
+
+        e1 = calc.calculate_equities(num_sims=50_000, seed=8, tol=0.01)
+        self.assertLess(calc.last_num_sims, 50_000)
+        self.assertEqual(calc.last_num_sims % SHARD_SIMS, 0)
+        self.assertGreater(e1[0], 0.8)
+        self.assertAlmostEqual(sum(e1.values()), 1.0, places=6)
+
+        e2 = calc.calculate_equities(num_sims=50_000, seed=8, tol=0.01)
+        self.assertEqual(e1, e2)
+
+    def test_no_tolerance_runs_all_sims(self):
+        calc = LiveOddsCalculator(2)
+        calc.add_player_hand([Card('A', 's'), Card('A', 'h')])
+        calc.add_player_hand([Card('7', 'd'), Card('2', 'c')])
+        calc.calculate_equities(num_sims=3_000, seed=8)
+        self.assertEqual(calc.last_num_sims, 3_000)
+
 
 class TestStreetProgression(unittest.TestCase):
     def test_preflop_to_river(self):
@@ -518,6 +614,78 @@ class TestFoldingEquityCalculation(unittest.TestCase):
         self.assertGreater(equities_after[2], equities_before[2])
         self.assertEqual(equities_after[1], 0.0)
 
+    def test_fold_rescores_cached_boards(self):
+        """A fold re-scores the previous boards instead of simulating again."""
+        calc = LiveOddsCalculator(3)
+        calc.add_player_hand([Card('A', 's'), Card('A', 'h')])
+        calc.add_player_hand([Card('7', 'd'), Card('2', 'c')])
+        calc.add_player_hand([Card('K', 's'), Card('K', 'h')])
+        calc.deal_flop([Card('9', 'c'), Card('5', 'h'), Card('3', 'd')])
+
+        # Flop runouts are enumerated in-process through _runout_strengths
+        with mock.patch('src.live_odds._runout_strengths', wraps=_runout_strengths) as evaluate:
+            calc.calculate_equities(num_sims=2000, seed=42)
+            self.assertEqual(evaluate.call_count, 1)
+            calc.fold_player(1)
+            equities = calc.calculate_equities(num_sims=2000, seed=42)
+        self.assertEqual(evaluate.call_count, 1)
+        self.assertEqual(equities[1], 0.0)
+        self.assertAlmostEqual(equities[0] + equities[2], 1.0, places=6)
+
+    def test_showdown_ranks_tally_like_strengths(self):
+        rng = np.random.default_rng(6)
+        strengths = rng.integers(0, 5, size=(500, 4)) * 1_000_000
+        ranks = _showdown_ranks(strengths)
+        self.assertEqual(ranks.dtype, np.int8)
+        for columns in ([0, 1, 2, 3], [0, 2], [1, 3, 2]):
+            expected = _tally(strengths[:, columns])
+            actual = _tally(ranks[:, columns])
+            np.testing.assert_array_equal(actual[0], expected[0])
+            np.testing.assert_array_equal(actual[1], expected[1])
+            self.assertEqual(actual[2], expected[2])
+
+    def test_enumerated_fold_cache_ignores_sim_arguments(self):
+        calc = LiveOddsCalculator(3)
+        calc.add_player_hand([Card('A', 's'), Card('A', 'h')])
+        calc.add_player_hand([Card('7', 'd'), Card('2', 'c')])
+        calc.add_player_hand([Card('K', 's'), Card('K', 'h')])
+        calc.deal_flop([Card('9', 'c'), Card('5', 'h'), Card('3', 'd')])
+
+        with mock.patch('src.live_odds._runout_strengths', wraps=_runout_strengths) as evaluate:
+            calc.calculate_equities(num_sims=2000, seed=42)
+            calc.fold_player(1)
+            calc.calculate_equities(num_sims=500, seed=7, tol=0.01)
+        self.assertEqual(evaluate.call_count, 1)
+
+    def test_copy_shares_samples_not_folds(self):
+        calc = LiveOddsCalculator(3)
+        calc.add_player_hand([Card('A', 's'), Card('A', 'h')])
+        calc.add_player_hand([Card('7', 'd'), Card('2', 'c')])
+        calc.add_player_hand([Card('K', 's'), Card('K', 'h')])
+        calc.calculate_equities(num_sims=2000, seed=42)
+
+        other = calc.copy()
+        other.fold_player(1)
+        self.assertEqual(calc.folded_players, set())
+        with mock.patch('src.live_odds._simulate_shard') as simulate:
+            other.calculate_equities(num_sims=2000, seed=42)
+        simulate.assert_not_called()
+
+    def test_new_street_invalidates_fold_cache(self):
+        calc = LiveOddsCalculator(3)
+        calc.add_player_hand([Card('A', 's'), Card('A', 'h')])
+        calc.add_player_hand([Card('7', 'd'), Card('2', 'c')])
+        calc.add_player_hand([Card('K', 's'), Card('K', 'h')])
+        calc.deal_flop([Card('9', 'c'), Card('5', 'h'), Card('3', 'd')])
+        calc.calculate_equities(num_sims=2000, seed=42)
+        calc.deal_turn(Card('J', 'd'))
+        calc.fold_player(1)
+
+        # The cached flop runouts must not be reused on the turn
+        calc.calculate_equities(num_sims=2000, seed=42)
+        self.assertEqual(calc.last_num_sims, 42)
+        self.assertEqual(len(calc._sample_cache['board']), 4)
+
     def test_folding_after_flop(self):
         """Folding works correctly after flop is dealt."""
         calc = LiveOddsCalculator(2)
@@ -1520,7 +1688,7 @@ class TestFoldedCardsNotInSimulations(unittest.TestCase):
         equities = calc.calculate_equities(num_sims=500, seed=42, capture_boards=True)
 
         boards = calc._last_captured_boards
-        self.assertEqual(len(boards), 500)  # Now we get 500 boards
+        self.assertEqual(len(boards), 903)  # Every turn/river from the 43 live cards
 
         # Each board should be 5 cards (3 from flop + 2 simulated)
         folded_cards = {('7', 'c'), ('2', 'c')}
@@ -1568,5 +1736,45 @@ class TestFoldedCardsNotInSimulations(unittest.TestCase):
             )
 
 
+class TestShardedSimulation(unittest.TestCase):
+    def _calc(self):
+        calc = LiveOddsCalculator(3)
+        calc.add_player_hand([Card('A', 's'), Card('A', 'h')])
+        calc.add_player_hand([Card('K', 'd'), Card('K', 'c')])
+        calc.add_player_hand([Card('7', 's'), Card('2', 'h')])
+        return calc
+
+    def test_process_pool_matches_serial_with_seed(self):
+        num_sims = 2 * SHARD_SIMS
+
+        with mock.patch('src.live_odds.os.cpu_count', return_value=1):
+            serial = self._calc().calculate_equities(num_sims=num_sims, seed=5)
+        with mock.patch('src.live_odds.os.cpu_count', return_value=2):
+            parallel = self._calc().calculate_equities(num_sims=num_sims, seed=5)
+
+        self.assertEqual(serial, parallel)
+        self.assertAlmostEqual(sum(parallel.values()), 1.0, places=6)
+
+    def test_tolerance_waves_match_serial_with_seed(self):
+        num_sims = 6 * SHARD_SIMS
+
+        with mock.patch('src.live_odds.os.cpu_count', return_value=1):
+            calc = self._calc()
+            serial = calc.calculate_equities(num_sims=num_sims, seed=5, tol=0.01)
+            serial_sims = calc.last_num_sims
+        with mock.patch('src.live_odds.os.cpu_count', return_value=4):
+            calc = self._calc()
+            parallel = calc.calculate_equities(num_sims=num_sims, seed=5, tol=0.01)
+
+        self.assertLess(serial_sims, num_sims)
+        self.assertEqual(calc.last_num_sims, serial_sims)
+        self.assertEqual(serial, parallel)
+
+    def test_uneven_shards_use_all_sims(self):
+        calc = self._calc()
+        calc.calculate_equities(num_sims=SHARD_SIMS + 7, seed=3, capture_boards=True)
+        self.assertEqual(len(calc._last_captured_boards), SHARD_SIMS + 7)
+
+
 if __name__ == '__main__':
     unittest.main()